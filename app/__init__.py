@@ -1,7 +1,7 @@
 # app/__init__.py
 import logging
 from pathlib import Path
-from flask import Flask
+from flask import Flask, url_for
 from flask_cors import CORS
 from flask_session import Session
 from .config import load_config
@@ -48,12 +48,39 @@ def create_app():
     from .routes.status import bp as status_bp
     from .routes.profession_override import bp as override_bp
     from .routes.root import bp as root_bp
+    from .routes.assets import bp as assets_bp
+    from .routes.admin import bp as admin_bp
 
     app.register_blueprint(analyze_bp)
     app.register_blueprint(chat_bp)
     app.register_blueprint(status_bp)
     app.register_blueprint(override_bp)
     app.register_blueprint(root_bp)
+    app.register_blueprint(assets_bp)
+    app.register_blueprint(admin_bp)
+
+    # ---- Statik varlıklar (parmak izi + ön sıkıştırma) ----
+    if app.config.get("ASSET_PIPELINE_ENABLED", True):
+        from .services.assets import AssetPipeline
+        app.extensions["assets"] = AssetPipeline(static_dir).build()
+
+    # ---- Yinelenen ilan indeksi (MinHash/LSH, kalıcı) ----
+    if app.config.get("JOB_DEDUP_ENABLED", True):
+        from .services.dedup import JobDedupIndex
+        try:
+            app.extensions["job_dedup"] = JobDedupIndex(
+                app.config["JOB_DEDUP_PATH"],
+                threshold=float(app.config.get("JOB_DEDUP_THRESHOLD", 0.8)),
+                max_entries=int(app.config.get("JOB_DEDUP_MAX_ENTRIES", 5000)),
+                min_shingles=int(app.config.get("JOB_DEDUP_MIN_SHINGLES", 50)),
+            )
+        except Exception as e:
+            app.logger.warning(f"[JobDedup] disabled: {e}")
+
+    @app.template_global()
+    def asset_url(filename: str) -> str:
+        pipeline = app.extensions.get("assets")
+        return (pipeline and pipeline.url(filename)) or url_for("static", filename=filename)
 
     # ---- Error handlers ----
     @app.errorhandler(404)
@@ -72,6 +99,11 @@ def create_app():
     # ---- Boot log ----
     app.logger.info("🚀 ATS Career Coach v3 - Modular")
     app.logger.info(f"🤖 Ollama: {app.config.get('OLLAMA_BASE_URL')} - Model: {app.config.get('OLLAMA_MODEL')}")
+    app.logger.info(f"🪜 Small model: {app.config.get('OLLAMA_SMALL_MODEL')} - Tiers: {app.config.get('OLLAMA_TASK_MODELS')}")
+    from .services.llm_client import TASKS
+    unknown = sorted(set(app.config.get("OLLAMA_TASK_MODELS") or {}) - set(TASKS))
+    if unknown:
+        app.logger.warning(f"⚠️ OLLAMA_TASK_MODELS has unknown tasks {unknown}; known: {list(TASKS)}")
     app.logger.info(f"🎯 Profession confidence threshold: {app.config.get('PROF_CONF_THRESHOLD')}")
 
     return app
@@ -0,0 +1,229 @@
+# app/batch.py
+"""
+Çevrimdışı toplu analiz: bir klasördeki PDF CV'leri bir URL listesine karşı
+analiz eder ve her (CV, ilan) çifti için bir JSONL satırı yazar.
+
+    python -m app.batch --cvs ./cvs --urls urls.txt --out results.jsonl --workers 4
+
+Çıktı dosyası aynı zamanda checkpoint'tir: yeniden çalıştırıldığında
+"ok": true olarak ve "degraded" boş yazılmış çiftler atlanır, yalnızca kalanlar
+işlenir. Zaman aşımı gibi geçici hatalar kayda "ok": false olarak yazılır.
+Flask uygulaması/request context'i gerekmez; ayarlar ortamdan (.env) okunur.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from multiprocessing import Pool
+from pathlib import Path
+
+from .config import current_config
+from .services import scraper
+from .services.scraper import WebScraper
+from .services.pdf_processor import PDFProcessor
+from .services.pipeline import job_side, cv_side, score_pair
+
+log = logging.getLogger("app.batch")
+
+# ---------------- worker ----------------
+# Her worker süreci kendi CV önbelleğini tutar; görevler CV bazında
+# gruplandığı için aynı CV'nin çiftleri genellikle aynı worker'a düşer.
+# İlan tarafı ise çiftlerden önce URL başına bir kez hesaplanıp görevle gönderilir.
+_CACHE_SIZE = 64
+_cv_cache = OrderedDict()
+_dedup = None
+
+def _memo(cache: OrderedDict, key, fn):
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = fn()
+    cache[key] = value
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+def _init_worker(use_dedup: bool):
+    global _dedup
+    logging.basicConfig(level=logging.WARNING, format="%(processName)s %(levelname)s %(message)s")
+    # Ebeveynin fetch_many ile doldurduğu keep-alive soketleri fork'ta miras kalır; paylaşma
+    scraper.reset_session()
+    if use_dedup:
+        from .services.dedup import JobDedupIndex
+        cfg = current_config()
+        try:
+            _dedup = JobDedupIndex(
+                cfg["JOB_DEDUP_PATH"],
+                threshold=float(cfg.get("JOB_DEDUP_THRESHOLD", 0.8)),
+                max_entries=int(cfg.get("JOB_DEDUP_MAX_ENTRIES", 5000)),
+                min_shingles=int(cfg.get("JOB_DEDUP_MIN_SHINGLES", 50)),
+            )
+        except Exception as e:
+            log.warning(f"[JobDedup] disabled: {e}")
+
+def _load_cv(path: str):
+    text = PDFProcessor.extract_text(Path(path).read_bytes())
+    if not text.strip():
+        raise ValueError("CV'den metin çıkarılamadı")
+    degraded = []
+    profession, conf, cv_ex = cv_side(text, degraded=degraded)
+    return text, profession, conf, cv_ex, degraded
+
+def analyze_job(task):
+    """(url, job_text|None) -> (url, (text, company_meta, job_ex, duplicate, degraded) | None, hata | None)"""
+    url, text = task
+    try:
+        if text is None:
+            text = WebScraper.fetch_job_description(url)
+        degraded = []
+        company_meta, job_ex, duplicate = job_side(text, url, _dedup, degraded=degraded)
+        return url, (text, company_meta, job_ex, duplicate, degraded), None
+    except Exception as e:
+        return url, None, str(e)
+
+def analyze_pair(task):
+    """(cv_path, cv_key, url, (job, hata)) -> JSONL kaydı. Hatalar kayda yazılır, yükseltilmez."""
+    cv_path, cv_key, url, (job, job_error) = task
+    t0 = time.perf_counter()
+    record = {"cv": cv_key, "job_url": url}
+    try:
+        if job is None:
+            raise Exception(job_error or "İş ilanı analiz edilemedi")
+        cv_text, profession, conf, cv_ex, cv_degraded = _memo(_cv_cache, cv_path, lambda: _load_cv(cv_path))
+        job_text, company_meta, job_ex, duplicate, job_degraded = job
+        degraded = list(job_degraded) + list(cv_degraded)
+        scored = score_pair(job_text, cv_text, job_ex, cv_ex, degraded=degraded)
+        analysis = scored["analysis"]
+        record.update({
+            "ok": True,
+            "score": analysis.score,
+            "similarity": round(analysis.similarity, 3),
+            "coverage": round(scored["coverage"], 3),
+            "profession": {
+                "name": profession.name,
+                "display_name": profession.display_name,
+                "confidence": round(float(conf), 3),
+            },
+            "company": company_meta,
+            "job_duplicate": (
+                {"url": duplicate["url"], "similarity": duplicate["similarity"]} if duplicate else None
+            ),
+            "matched": scored["matched"],
+            "missing": scored["missing"],
+            "issues": analysis.issues,
+            "sections": analysis.sections,
+            "degraded": degraded,
+        })
+    except Exception as e:
+        record.update({"ok": False, "error": str(e)})
+    record["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    return record
+
+# ---------------- driver ----------------
+def _read_urls(path: str):
+    urls = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return list(OrderedDict.fromkeys(urls))
+
+def _completed(out_path: Path) -> set:
+    done = set()
+    if not out_path.exists():
+        return done
+    with out_path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # yarım kalmış son satır
+            # Yedek yola düşmüş çiftler tamamlanmış sayılmaz; yeniden denenir
+            if rec.get("ok") and not rec.get("degraded"):
+                done.add((rec.get("cv"), rec.get("job_url")))
+    return done
+
+def prefetch(urls, concurrency=None, per_domain=None, min_interval=None) -> dict:
+    """İlanları eşzamanlı çek (alan adı sınırlı); url -> metin. Başarısızlar worker'da yeniden denenir."""
+    texts = {}
+    for res in WebScraper.fetch_many(urls, max_workers=concurrency, per_domain=per_domain,
+                                     min_interval=min_interval):
+        if res.ok:
+            texts[res.url] = res.text
+        log.info(
+            f"[fetch] {res.url} {'ok' if res.ok else 'FAIL ' + (res.error or '')} "
+            f"({res.elapsed:.2f}s, waited {res.waited:.2f}s)"
+        )
+    return texts
+
+def run(cv_dir: str, urls_file: str, out: str, workers: int = 2, use_dedup: bool = True,
+        fetch_concurrency=None, per_domain=None, min_interval=None) -> dict:
+    root = Path(cv_dir)
+    pdfs = sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() == ".pdf")
+    urls = _read_urls(urls_file)
+    out_path = Path(out)
+    done = _completed(out_path)
+
+    # CV-major sıra: aynı CV'nin çiftleri ardışık (worker önbelleği için)
+    pending = [
+        (str(p), p.relative_to(root).as_posix(), u)
+        for p in pdfs for u in urls
+        if (p.relative_to(root).as_posix(), u) not in done
+    ]
+    total = len(pdfs) * len(urls)
+    log.info(f"{len(pdfs)} CV x {len(urls)} URL = {total} pairs; {total - len(pending)} already done")
+    stats = {"total": total, "skipped": total - len(pending), "ok": 0, "failed": 0}
+    if not pending:
+        return stats
+
+    # İlanlar önce toplu ve eşzamanlı çekilir; worker'lar yalnızca LLM/skor işini yapar
+    pending_urls = list(OrderedDict.fromkeys(u for _, _, u in pending))
+    texts = prefetch(pending_urls, fetch_concurrency, per_domain, min_interval)
+
+    with out_path.open("a", encoding="utf-8") as fh, \
+            Pool(processes=max(1, workers), initializer=_init_worker, initargs=(use_dedup,)) as pool:
+        # 1) İlan tarafı URL başına bir kez (paralel); sonuç çift görevlerine eklenir
+        jobs = {}
+        for url, job, error in pool.imap_unordered(analyze_job, [(u, texts.get(u)) for u in pending_urls]):
+            jobs[url] = (job, error)
+            log.info(f"[job] {url} {'ok' if job else 'FAIL ' + (error or '')}")
+        tasks = [(path, key, u, jobs[u]) for path, key, u in pending]
+
+        # 2) Çiftler: CV tarafı (worker başına önbellekli) + skor
+        chunk = max(1, min(len(urls), len(tasks) // max(1, workers * 4) or 1))
+        for rec in pool.imap_unordered(analyze_pair, tasks, chunksize=chunk):
+            fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+            stats["ok" if rec.get("ok") else "failed"] += 1
+            log.info(
+                f"[{stats['ok'] + stats['failed']}/{len(tasks)}] {rec['cv']} <- {rec['job_url']} "
+                f"{'score=' + str(rec.get('score')) if rec.get('ok') else 'ERROR ' + rec.get('error', '')}"
+            )
+    return stats
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.batch", description="Offline batch CV/job analyzer")
+    ap.add_argument("--cvs", required=True, help="PDF CV klasörü (alt klasörler dahil)")
+    ap.add_argument("--urls", required=True, help="Satır başına bir iş ilanı URL'si içeren dosya")
+    ap.add_argument("--out", required=True, help="JSONL çıktı/checkpoint dosyası")
+    ap.add_argument("--workers", type=int, default=2, help="Worker süreç sayısı")
+    ap.add_argument("--no-dedup", action="store_true", help="Yakın kopya ilan indeksini kullanma")
+    ap.add_argument("--fetch-concurrency", type=int, default=None, help="Toplam eşzamanlı ilan çekme")
+    ap.add_argument("--per-domain", type=int, default=None, help="Alan adı başına eşzamanlı istek")
+    ap.add_argument("--min-interval", type=float, default=None, help="Aynı alan adına istekler arası saniye")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    use_dedup = not args.no_dedup and bool(current_config().get("JOB_DEDUP_ENABLED", True))
+    stats = run(args.cvs, args.urls, args.out, workers=args.workers, use_dedup=use_dedup,
+                fetch_concurrency=args.fetch_concurrency, per_domain=args.per_domain,
+                min_interval=args.min_interval)
+    log.info(f"Done: {stats}")
+    return 0 if stats["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
-import os, tempfile
+import os, tempfile, logging
 from dotenv import load_dotenv
+from flask import current_app, has_app_context
 
 load_dotenv()
 
@@ -10,9 +11,85 @@ def load_config():
         "OLLAMA_MODEL": os.environ.get("OLLAMA_MODEL", "qwen2.5:7b-instruct"),
         "OLLAMA_TIMEOUT": int(os.environ.get("OLLAMA_TIMEOUT", "60")),
 
+        # ---- Görev bazlı model tier'ları ----
+        # Değerler: "small" | "large" | doğrudan Ollama model adı
+        "OLLAMA_SMALL_MODEL": os.environ.get("OLLAMA_SMALL_MODEL", "qwen2.5:1.5b-instruct"),
+        "OLLAMA_TASK_MODELS": {
+            "company":    os.environ.get("OLLAMA_MODEL_COMPANY", "small"),
+            "profession": os.environ.get("OLLAMA_MODEL_PROFESSION", "small"),
+            "skills":     os.environ.get("OLLAMA_MODEL_SKILLS", "small"),
+            "align":      os.environ.get("OLLAMA_MODEL_ALIGN", "small"),
+            "chat":       os.environ.get("OLLAMA_MODEL_CHAT", "large"),
+        },
+        # Küçük model doğrulamayı geçemezse büyük modele yükselt
+        "OLLAMA_ESCALATE": os.environ.get("OLLAMA_ESCALATE", "1") not in ("0", "false", "False"),
+
+        # ---- İş ilanı çekme ----
+        "SCRAPER_TIMEOUT": float(os.environ.get("SCRAPER_TIMEOUT", "15")),
+        # /api/analyze uçtan uca zaman bütçesi (saniye, 0 = sınırsız)
+        "ANALYZE_DEADLINE_S": float(os.environ.get("ANALYZE_DEADLINE_S", "60")),
+        # Toplu çekme: toplam / alan adı başına eşzamanlılık, alan adı başına istek aralığı (s)
+        "SCRAPER_MAX_CONCURRENCY": int(os.environ.get("SCRAPER_MAX_CONCURRENCY", "8")),
+        "SCRAPER_PER_DOMAIN": int(os.environ.get("SCRAPER_PER_DOMAIN", "2")),
+        "SCRAPER_DOMAIN_INTERVAL": float(os.environ.get("SCRAPER_DOMAIN_INTERVAL", "1.0")),
+
+        # ---- Spekülatif ilan analizi (URL girilince) ----
+        # Oturum başına arka planda scrape + şirket + ilan yetenekleri; /api/analyze devralır
+        "PREFETCH_ENABLED": os.environ.get("PREFETCH_ENABLED", "1") not in ("0", "false", "False"),
+        "PREFETCH_WORKERS": int(os.environ.get("PREFETCH_WORKERS", "2")),
+        "PREFETCH_QUEUE_SIZE": int(os.environ.get("PREFETCH_QUEUE_SIZE", "16")),
+        "PREFETCH_TTL": float(os.environ.get("PREFETCH_TTL", "300")),
+
         # ---- Meslek eşiği ----
         "PROF_CONF_THRESHOLD": float(os.environ.get("PROF_CONF_THRESHOLD", "0.6")),
 
+        # ---- Chat cevap önbelleği (opt-in) ----
+        # Aynı meslek/ilan/eksik-yetenek bağlamındaki benzer sorular cache'ten yanıtlanır.
+        "CHAT_CACHE_ENABLED": os.environ.get("CHAT_CACHE_ENABLED", "0") in ("1", "true", "True"),
+        "CHAT_CACHE_SIMILARITY": float(os.environ.get("CHAT_CACHE_SIMILARITY", "0.9")),
+        "CHAT_CACHE_MAX_ENTRIES": int(os.environ.get("CHAT_CACHE_MAX_ENTRIES", "500")),
+
+        # ---- Chat SSE relay ----
+        # parse | passthrough (NDJSON satırı aynen) | coalesce (token birleştirme)
+        "CHAT_RELAY_MODE": os.environ.get("CHAT_RELAY_MODE", "coalesce"),
+        "CHAT_RELAY_FLUSH_MS": int(os.environ.get("CHAT_RELAY_FLUSH_MS", "50")),
+        "CHAT_RELAY_FLUSH_BYTES": int(os.environ.get("CHAT_RELAY_FLUSH_BYTES", "1024")),
+
+        # ---- Statik varlık hattı ----
+        "ASSET_PIPELINE_ENABLED": os.environ.get("ASSET_PIPELINE_ENABLED", "1") not in ("0", "false", "False"),
+
+        # ---- İstek profilleme (opt-in) ----
+        # X-Profile: 1 başlığı veya örnekleme oranı ile /api/analyze profillenir
+        "PROFILING_ENABLED": os.environ.get("PROFILING_ENABLED", "0") in ("1", "true", "True"),
+        "PROFILING_SAMPLE_RATE": float(os.environ.get("PROFILING_SAMPLE_RATE", "0")),
+        "PROFILING_MIN_MS": float(os.environ.get("PROFILING_MIN_MS", "0")),
+        "PROFILING_MAX_PROFILES": int(os.environ.get("PROFILING_MAX_PROFILES", "20")),
+        # Worker'lar arası paylaşılan profil dizini (aynı makinedeki tüm worker'lar görür)
+        "PROFILING_DIR": os.environ.get(
+            "PROFILING_DIR", os.path.join(tempfile.gettempdir(), "jobchat_profiles")
+        ),
+        # Boşsa /api/admin/* uçları kapalıdır
+        "ADMIN_TOKEN": os.environ.get("ADMIN_TOKEN", ""),
+
+        # ---- Yinelenen ilan tespiti (MinHash/LSH) ----
+        "JOB_DEDUP_ENABLED": os.environ.get("JOB_DEDUP_ENABLED", "1") not in ("0", "false", "False"),
+        "JOB_DEDUP_PATH": os.environ.get(
+            "JOB_DEDUP_PATH", os.path.join(tempfile.gettempdir(), "jobchat_job_index.sqlite")
+        ),
+        "JOB_DEDUP_THRESHOLD": float(os.environ.get("JOB_DEDUP_THRESHOLD", "0.8")),
+        "JOB_DEDUP_MAX_ENTRIES": int(os.environ.get("JOB_DEDUP_MAX_ENTRIES", "5000")),
+        # Bundan az 5 kelimelik shingle üreten (kısa/boilerplate) sayfalar indekslenmez
+        "JOB_DEDUP_MIN_SHINGLES": int(os.environ.get("JOB_DEDUP_MIN_SHINGLES", "50")),
+
+        # ---- Chat yeniden bağlanma (Last-Event-ID) ----
+        # Biten üretimlerin çerçeve tamponu bu kadar saniye saklanır
+        "CHAT_RESUME_TTL": float(os.environ.get("CHAT_RESUME_TTL", "120")),
+        # İstemci koptuktan sonra upstream üretim iptal edilmeden önce beklenen süre
+        # (0 = hemen). Last-Event-ID ile devam için tarayıcının reconnect süresinden
+        # (SSE 'retry', chat_stream.RETRY_MS = 10 s) uzun olmalı; aynı oturumda yeni soru
+        # önceki üretimi her zaman hemen iptal eder.
+        "CHAT_CANCEL_GRACE_S": float(os.environ.get("CHAT_CANCEL_GRACE_S", "15")),
+
         # ---- Flask secret ----
         "SECRET_KEY": os.environ.get("SECRET_KEY", "ats-career-coach-v3"),
 
@@ -24,3 +101,18 @@ def load_config():
         "SESSION_COOKIE_SAMESITE": "Lax",
         "SESSION_COOKIE_SECURE": False,  # local geliştirme
     }
+
+# ---- App context dışı kullanım (CLI / batch) ----
+_standalone_config = None
+
+def current_config():
+    """Flask app context varsa app.config, yoksa ortamdan yüklenen config."""
+    global _standalone_config
+    if has_app_context():
+        return current_app.config
+    if _standalone_config is None:
+        _standalone_config = load_config()
+    return _standalone_config
+
+def current_logger() -> logging.Logger:
+    return current_app.logger if has_app_context() else logging.getLogger("app")
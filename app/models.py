@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 @dataclass
 class AnalysisResult:
@@ -18,3 +18,20 @@ class ProfessionProfile:
     keywords: List[str]
     technologies: List[str]
     description: str
+
+@dataclass
+class FetchResult:
+    url: str
+    ok: bool
+    text: str = ""
+    error: Optional[str] = None
+    status: Optional[int] = None
+    elapsed: float = 0.0   # istek süresi (s)
+    waited: float = 0.0    # alan adı sınırı/oran bekleme süresi (s)
+
+@dataclass
+class CVFeatures:
+    sections: Dict[str, bool]
+    has_phone: bool
+    has_email: bool
+    length: int
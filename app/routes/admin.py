@@ -0,0 +1,35 @@
+# app/routes/admin.py
+import hmac
+from flask import Blueprint, Response, request, jsonify, current_app as app
+from ..services.profiler import ProfileStore, stats_bytes, stats_text
+
+bp = Blueprint("admin", __name__)
+
+def _authorized() -> bool:
+    token = app.config.get("ADMIN_TOKEN") or ""
+    given = request.headers.get("X-Admin-Token", "")
+    return bool(token) and hmac.compare_digest(token, given)
+
+@bp.route("/api/admin/profiles")
+def list_profiles():
+    if not _authorized():
+        return jsonify({"error": "Yetkisiz"}), 403
+    return jsonify({"profiles": ProfileStore.list(app.config["PROFILING_DIR"])})
+
+@bp.route("/api/admin/profiles/<profile_id>")
+def download_profile(profile_id):
+    if not _authorized():
+        return jsonify({"error": "Yetkisiz"}), 403
+    record = ProfileStore.get(app.config["PROFILING_DIR"], profile_id)
+    if not record:
+        return jsonify({"error": "Profil bulunamadı"}), 404
+
+    if request.args.get("format") == "text":
+        return Response(stats_text(record), mimetype="text/plain")
+
+    # pstats / snakeviz ile açılabilir
+    return Response(
+        stats_bytes(record),
+        mimetype="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+    )
@@ -1,88 +1,26 @@
 # app/routes/analyze.py
+from urllib.parse import urlsplit
 from flask import Blueprint, request, jsonify, session, current_app as app
 from ..services.scraper import WebScraper
 from ..services.pdf_processor import PDFProcessor
-from ..services.profession import ProfessionDetector
-from ..services.skills import SkillExtractor, SkillAligner
-from ..services.company import CompanyExtractor
-from ..services.analysis import CVAnalyzer
-import re
+from ..services.pipeline import job_side, cv_side, score_pair, coerce_extract_result
+from ..services.profiler import profiled
+from ..services.deadline import Deadline, is_deadline_error
+from ..services.prefetch import JobPrefetcher
 
 bp = Blueprint("analyze", __name__)
 
-# ---------------- helpers ----------------
-def _normalize_token(s: str) -> str:
-    s = (s or "").strip().lower()
-    s = re.sub(r"[\s\-_/]+", " ", s)
-    s = s.replace("’", "'").replace("`", "'")
-    s = s.replace(". net", ".net")
-    return s
+def _is_http_url(url: str) -> bool:
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and bool(parts.netloc)
 
-def _coerce_extract_result(x):
-    """
-    SkillExtractor.extract bazen list, bazen dict dönebilir.
-    Her durumda şu şemaya indir:
-    {"skills": [...], "alias_map": {...}, "noise": [...]}
-    """
-    if isinstance(x, dict):
-        skills = x.get("skills") or []
-        alias_map = x.get("alias_map") or {}
-        noise = x.get("noise") or []
-    elif isinstance(x, list):
-        skills, alias_map, noise = x, {}, []
-    else:
-        skills, alias_map, noise = [], {}, []
-
-    # uniq + trim (normalize ederek benzersizleştir)
-    seen, out = set(), []
-    for s in skills:
-        t = str(s).strip()
-        n = _normalize_token(t)
-        if n and n not in seen:
-            seen.add(n)
-            out.append(t)
-    return {"skills": out, "alias_map": alias_map, "noise": noise}
-
-def _simple_align(job_skills, cv_skills):
-    """
-    LLM hizalama başarısız olursa devreye giren basit eşleme.
-    Normalizasyon üzerine set kesişimi/diff.
-    """
-    j_norm = { _normalize_token(s): s for s in job_skills }
-    c_norm = { _normalize_token(s): s for s in cv_skills }
-
-    matched_norm = set(j_norm) & set(c_norm)
-    missing_norm = set(j_norm) - set(c_norm)
-
-    matched = [j_norm[n] for n in sorted(matched_norm)]
-    missing = [j_norm[n] for n in sorted(missing_norm)]
-
-    return {
-        "matched": matched,
-        "missing": missing,
-        "job_canon": list(j_norm.values()),
-        "cv_canon": list(c_norm.values()),
-    }
-
-def _final_consistency(job_canon, cv_canon, matched, missing):
-    """
-    LLM'den gelen matched/missing listelerini normalize ederek yeniden üret
-    ve çakışma varsa düzelt (aynı skill hem matched hem missing olmayacak).
-    """
-    j_norm = { _normalize_token(s): s for s in job_canon }
-    c_norm = { _normalize_token(s): s for s in cv_canon }
-
-    matched_norm = set(j_norm) & set(c_norm)
-    # missing = job - cv
-    missing_norm = set(j_norm) - set(c_norm)
-
-    matched_fixed = [j_norm[n] for n in sorted(matched_norm)]
-    missing_fixed = [j_norm[n] for n in sorted(missing_norm)]
-
-    return matched_fixed, missing_fixed
+def _scrape_timeout(deadline: Deadline, cap) -> float:
+    """Kalan bütçe, ama en az deadline.floor: ilan metni hiçbir zaman atlanmaz."""
+    return min(float(cap), max(deadline.remaining(), deadline.floor))
 
 # --------------- route -------------------
 @bp.route("/api/analyze", methods=["POST"])
+@profiled("analyze")
 def analyze_cv():
     try:
         job_url = request.form.get("job_url", "").strip()
@@ -95,53 +33,70 @@ def analyze_cv():
 
         app.logger.info(f"[Analyze] URL: {job_url}")
 
+        # İstek zaman bütçesi: süre biterse aşamalar deterministik yola düşer
+        deadline = Deadline(app.config["ANALYZE_DEADLINE_S"])
+        degraded = []
+
         # --- veri çıkar ---
-        job_description = WebScraper.fetch_job_description(job_url)
         cv_content = PDFProcessor.extract_text(file.read())
         if not cv_content.strip():
             return jsonify({"error": "CV'den metin çıkarılamadı. PDF formatını kontrol edin."}), 400
 
-        # Şirket/persona (opsiyonel)
-        try:
-            company_meta = CompanyExtractor.parse(job_description) or {}
-        except Exception:
-            company_meta = {}
-
-        # Meslek tespiti
-        profession, conf = ProfessionDetector.detect(cv_content)
+        # URL girilince başlatılan prefetch sürüyorsa/bittiyse devral (beklemeden)
+        prefetch_job = None
+        if app.config.get("PREFETCH_ENABLED", True):
+            prefetch_job = JobPrefetcher.claim(getattr(session, "sid", None), job_url)
+        running = prefetch_job is not None and not prefetch_job.done.is_set()
+
+        # Süren prefetch varsa CV tarafı önce (prefetch arka planda ilerler);
+        # yoksa ilan tarafı önce, böylece ilan bütçe bitmeden çekilir
+        if running:
+            profession, conf, cv_ex = cv_side(cv_content, deadline=deadline, degraded=degraded)
+
+        # İş ilanı tarafı: prefetch sonucu (kalan bütçe kadar beklenir) ya da satır içi
+        prefetched = None
+        if prefetch_job is not None:
+            wait = max(0.0, deadline.remaining() - deadline.floor)
+            prefetched = JobPrefetcher.result(prefetch_job, timeout=wait if wait != float("inf") else None)
+        if prefetched:
+            job_description, company_meta, job_ex, duplicate = prefetched
+            degraded.extend(d for d in prefetch_job.degraded if d not in degraded)
+            app.logger.info(f"[Prefetch] job side reused for {job_url}")
+        else:
+            # Bütçe bitmiş olsa da ilan çekilir; LLM aşamaları deterministik yola düşer
+            try:
+                job_description = WebScraper.fetch_job_description(
+                    job_url, timeout=_scrape_timeout(deadline, app.config["SCRAPER_TIMEOUT"])
+                )
+            except Exception as e:
+                if not is_deadline_error(e, deadline):
+                    raise
+                # İlan bütçe içinde hiç çekilemedi: ilan tarafı olmadan skorla
+                job_description, company_meta, job_ex, duplicate = "", {}, coerce_extract_result([]), None
+                degraded.append("job_side")
+                app.logger.warning(f"[Deadline] job side degraded for {job_url}: {e}")
+            else:
+                # Yakın kopya ilanlarda önceki sonuçlar yeniden kullanılır
+                company_meta, job_ex, duplicate = job_side(
+                    job_description, job_url, app.extensions.get("job_dedup"),
+                    deadline=deadline, degraded=degraded
+                )
+
+        if not running:
+            profession, conf, cv_ex = cv_side(cv_content, deadline=deadline, degraded=degraded)
         needs_manual = conf < app.config["PROF_CONF_THRESHOLD"] or profession.name == "unknown"
         app.logger.info(f"[ProfessionDetector] {profession.display_name} (conf={conf:.2f})")
 
-        # Yetenek çıkar (LLM) -> dict'e zorla
-        job_raw = SkillExtractor.extract(job_description)
-        cv_raw  = SkillExtractor.extract(cv_content)
-        job_ex  = _coerce_extract_result(job_raw)
-        cv_ex   = _coerce_extract_result(cv_raw)
-
-        # Hizalama (LLM -> fallback)
-        try:
-            alignment = SkillAligner.align(job_ex["skills"], cv_ex["skills"])
-        except Exception:
-            alignment = _simple_align(job_ex["skills"], cv_ex["skills"])
-
-        job_canon = alignment.get("job_canon") or job_ex["skills"]
-        cv_canon  = alignment.get("cv_canon")  or cv_ex["skills"]
-        matched   = alignment.get("matched")   or []
-        missing   = alignment.get("missing")   or []
-
-        # 🔒 Son tutarlılık düzeltmesi: normalize kesişim/fark
-        matched, missing = _final_consistency(job_canon, cv_canon, matched, missing)
-
-        coverage = (len(matched) / max(1, len(job_canon))) if job_canon else 0.0
-
-        # ATS skor (hizalanmış listelerle)
-        analysis = CVAnalyzer.analyze_ats_score(
-            job_description=job_description,
-            cv_text=cv_content,
-            job_skills=job_canon,
-            matched_skills=matched,
-            missing_skills_input=missing
-        )
+        # Hizalama + ATS skor
+        scored    = score_pair(job_description, cv_content, job_ex, cv_ex,
+                               deadline=deadline, degraded=degraded)
+        cv_ex     = cv_ex or {}
+        job_canon = scored["job_canon"]
+        cv_canon  = scored["cv_canon"]
+        matched   = scored["matched"]
+        missing   = scored["missing"]
+        coverage  = scored["coverage"]
+        analysis  = scored["analysis"]
 
         # Cookie session limiti için kırp
         JOB_SNIPPET = 1200
@@ -168,7 +123,8 @@ def analyze_cv():
 
         app.logger.info(
             f"[Analyze] Profession={profession.display_name} (conf={conf:.2f}) "
-            f"manual={needs_manual} ATS={analysis.score}"
+            f"manual={needs_manual} ATS={analysis.score} "
+            f"elapsed={deadline.elapsed():.1f}s degraded={degraded}"
         )
 
         return jsonify({
@@ -179,6 +135,9 @@ def analyze_cv():
                 "required_fields": ["name", "display_name", "description"] if needs_manual else []
             },
             "company": company_meta,
+            "job_duplicate": (
+                {"url": duplicate["url"], "similarity": duplicate["similarity"]} if duplicate else None
+            ),
             "profession": {
                 "name": profession.name,
                 "display_name": profession.display_name,
@@ -206,9 +165,50 @@ def analyze_cv():
                     "cv_noise": cv_ex.get("noise", []),
                 }
             },
+            "job_prefetched": bool(prefetched),
+            "degraded": degraded,
+            "deadline": {
+                "budget_s": deadline.budget,
+                "elapsed_s": round(deadline.elapsed(), 2),
+            },
             "cv_preview": cv_content[:800]
         })
 
     except Exception as e:
         app.logger.exception("Analysis error")
         return jsonify({"error": f"Analiz hatası: {str(e)}"}), 500
+
+
+@bp.route("/api/analyze/prefetch", methods=["POST"])
+def prefetch_job():
+    """
+    İlan URL'si girilince iş ilanı tarafını arka planda başlat. Boş URL
+    oturumun bekleyen prefetch'ini iptal eder; yeni URL eskisini iptal eder.
+    """
+    if not app.config.get("PREFETCH_ENABLED", True):
+        return jsonify({"status": "disabled"}), 404
+
+    data = request.get_json(silent=True) or request.form
+    job_url = (data.get("job_url") or "").strip()
+    owner = getattr(session, "sid", None)
+    if not owner:
+        return jsonify({"error": "Oturum bulunamadı"}), 400
+
+    if not job_url:
+        session.pop("prefetch_url", None)
+        return jsonify({"status": "cancelled" if JobPrefetcher.cancel(owner) else "idle"})
+    if not _is_http_url(job_url):
+        return jsonify({"error": "Geçerli bir iş ilanı URL'si gerekli"}), 400
+
+    job = JobPrefetcher.submit(
+        owner, job_url, app._get_current_object(), app.extensions.get("job_dedup"),
+        workers=app.config.get("PREFETCH_WORKERS", 2),
+        queue_size=app.config.get("PREFETCH_QUEUE_SIZE", 16),
+        ttl=app.config.get("PREFETCH_TTL", 300),
+    )
+    # Oturumu değiştir ki yeni ziyaretçide de session cookie'si yazılsın
+    # (aksi halde /api/analyze farklı bir sid ile gelir)
+    session["prefetch_url"] = job_url
+    if job is None:
+        return jsonify({"status": "rejected", "job_url": job_url}), 429
+    return jsonify({"status": job.status, "job_url": job_url}), 202
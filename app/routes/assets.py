@@ -0,0 +1,33 @@
+# app/routes/assets.py
+from flask import Blueprint, Response, request, current_app as app
+
+bp = Blueprint("assets", __name__)
+
+# Parmak izli URL içerik değişince değişir -> sonsuz önbellek güvenli
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+@bp.route("/assets/<path:filename>")
+def serve_asset(filename):
+    pipeline = app.extensions.get("assets")
+    asset = pipeline.lookup(filename) if pipeline else None
+    if asset is None:
+        return {"error": "Endpoint bulunamadı"}, 404
+
+    encoding = "identity"
+    for enc in ("br", "gzip"):
+        if enc in asset.variants and request.accept_encodings[enc] > 0:
+            encoding = enc
+            break
+
+    etag = f"{asset.digest}-{encoding}"
+    headers = {"Cache-Control": IMMUTABLE, "Vary": "Accept-Encoding"}
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304, headers=headers)
+        resp.set_etag(etag)
+        return resp
+
+    resp = Response(asset.variants[encoding], mimetype=asset.mimetype, headers=headers)
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    resp.set_etag(etag)
+    return resp
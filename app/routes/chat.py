@@ -1,9 +1,15 @@
 # app/routes/chat.py
 import json
+import time
+import threading
 import requests
 import logging
 from flask import Blueprint, request, jsonify, Response, session, current_app as app
 from ..services.prompt import PromptGenerator
+from ..services.llm_client import LLMClient, ModelUsage
+from ..services.answer_cache import AnswerCache
+from ..services.sse_relay import SSERelay
+from ..services.chat_stream import ChatRegistry, sse_frames, produce
 from ..models import ProfessionProfile
 
 bp = Blueprint("chat", __name__)
@@ -14,6 +20,21 @@ def chat_stream():
     if not question:
         return jsonify({"error": "Soru boş olamaz"}), 400
 
+    # ---- Yeniden bağlanma: Last-Event-ID varsa tampondan/süren üretimden devam et
+    owner = getattr(session, "sid", None)
+    resume_ttl = float(app.config.get("CHAT_RESUME_TTL", 120))
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    resumed = ChatRegistry.resume(last_event_id, owner, resume_ttl)
+    if resumed:
+        gen, start = resumed
+        app.logger.info(f"[Chat] resuming {gen.id} from seq {start}")
+        return _sse_response(sse_frames(gen, start, float(app.config.get("CHAT_CANCEL_GRACE_S", 15))))
+    # Devam edilemeyen yeniden bağlantı (TTL doldu / başka worker): istemci
+    # kısmi cevabı silsin, yeni cevap baştan akacak
+    reset = bool(last_event_id)
+    if reset:
+        app.logger.info(f"[Chat] cannot resume {last_event_id}; restarting with reset frame")
+
     # ---- Session verileri
     job_description = session.get("job_description", "")
     cv_content      = session.get("cv_content", "")
@@ -78,14 +99,41 @@ Eşleşen Yetenekler: {', '.join(matched_skills[:10])}
 
     # ❗️Kritik: app context kapanmadan önce CONFIG ve LOGGER'ı capture et
     ollama_base   = app.config.get("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
-    ollama_model  = app.config.get("OLLAMA_MODEL", "qwen2.5:7b-instruct")
+    ollama_tier, ollama_model = LLMClient.resolve("chat")
     ollama_timeout = int(app.config.get("OLLAMA_TIMEOUT", 60))
+    relay_mode    = app.config.get("CHAT_RELAY_MODE", "coalesce")
+    relay_ms      = int(app.config.get("CHAT_RELAY_FLUSH_MS", 50))
+    relay_bytes   = int(app.config.get("CHAT_RELAY_FLUSH_BYTES", 1024))
     log = app.logger  # Logger objesini kopyalamak güvenli
 
-    def generate():
-        # EventSource için reconnect süresi
-        yield "retry: 10000\n\n"
+    # Üretim istemci bağlantısından bağımsız bir thread'de sürer; çerçeveler
+    # tamponlanır, kopan bağlantı Last-Event-ID ile kaldığı yerden devam eder.
+    # Aynı oturumdaki süren önceki üretim burada iptal edilir (supersede) —
+    # cevap önbellekten gelse bile.
+    cancel_grace = float(app.config.get("CHAT_CANCEL_GRACE_S", 15))
+    gen = ChatRegistry.create(owner, resume_ttl)
+    if reset:
+        # İstemci önceki kısmi çıktıyı temizlesin; tampondaki ilk çerçeve
+        gen.append(_sse_pack({"reset": True}))
+
+    # Anlamsal cevap önbelleği (opt-in): isabette LLM hiç çağrılmaz
+    cache_key = None
+    cache_max = int(app.config.get("CHAT_CACHE_MAX_ENTRIES", 500))
+    if app.config.get("CHAT_CACHE_ENABLED"):
+        cache_key = AnswerCache.context_key(
+            profession.name, job_description, session.get("missing_skills") or [],
+            cv_text=cv_content[:1500]  # prompt'a giren CV kısmı; cevaplar başka CV'ye sızmaz
+        )
+        cached = AnswerCache.lookup(
+            cache_key, question, float(app.config.get("CHAT_CACHE_SIMILARITY", 0.9))
+        )
+        if cached is not None:
+            log.info("[Chat] answer cache hit")
+            # Tekrar oynatma da tampona yazılır: çerçeveler id taşır, devam edilebilir
+            produce(gen, _replay(cached, ollama_model))
+            return _sse_response(sse_frames(gen, cancel_grace=cancel_grace))
 
+    def generate():
         url = f"{ollama_base}/api/chat"
         payload = {
             "model": ollama_model,
@@ -97,36 +145,70 @@ Eşleşen Yetenekler: {', '.join(matched_skills[:10])}
             "options": {"temperature": 0.7, "top_p": 0.9, "max_tokens": 2000}
         }
 
+        t0 = time.perf_counter()
+        ok = False
+        parts = []
+        state = {}
         try:
             with requests.post(url, json=payload, stream=True, timeout=ollama_timeout) as r:
+                # İptal bu yanıtı kapatır -> Ollama bağlantı kopunca üretimi durdurur
+                gen.upstream = r
                 r.raise_for_status()
-                for raw in r.iter_lines(decode_unicode=True):
-                    if not raw:
-                        continue
-                    try:
-                        obj = json.loads(raw)
-                    except Exception:
-                        continue
-                    yield f"data: {json.dumps(obj, ensure_ascii=False)}\n\n"
-                    if obj.get("done"):
+                # Ollama charset belirtmez; aksi halde iter_lines bytes döndürür
+                r.encoding = "utf-8"
+                for frame in SSERelay.frames(
+                    r.iter_lines(decode_unicode=True),
+                    mode=relay_mode,
+                    flush_ms=relay_ms,
+                    flush_bytes=relay_bytes,
+                    collect=parts if cache_key else None,
+                    state=state,
+                ):
+                    if gen.cancelled:
                         break
+                    yield frame
+                ok = bool(state.get("done")) and not state.get("error") and not gen.cancelled
 
-        except requests.exceptions.Timeout:
-            yield _sse_pack({"error": "AI koç yanıt vermede gecikti (timeout). Lütfen tekrar deneyin.", "done": True})
-        except requests.exceptions.ConnectionError:
-            yield _sse_pack({"error": "Ollama bağlantısı kurulamadı. Servisin çalıştığını doğrulayın.", "done": True})
         except Exception as e:
-            # current_app kullanmıyoruz; önceden alınan logger'ı kullanıyoruz
-            try:
-                log.exception("Chat streaming error")
-            except Exception:
-                logging.getLogger(__name__).exception("Chat streaming error (fallback logger)")
-            yield _sse_pack({"error": f"Beklenmeyen hata: {str(e)}", "done": True})
+            if gen.cancelled:
+                pass  # kapatılan upstream okuma hatası beklenen durum
+            elif isinstance(e, requests.exceptions.Timeout):
+                yield _sse_pack({"error": "AI koç yanıt vermede gecikti (timeout). Lütfen tekrar deneyin.", "done": True})
+            elif isinstance(e, requests.exceptions.ConnectionError):
+                yield _sse_pack({"error": "Ollama bağlantısı kurulamadı. Servisin çalıştığını doğrulayın.", "done": True})
+            else:
+                # current_app kullanmıyoruz; önceden alınan logger'ı kullanıyoruz
+                try:
+                    log.exception("Chat streaming error")
+                except Exception:
+                    logging.getLogger(__name__).exception("Chat streaming error (fallback logger)")
+                yield _sse_pack({"error": f"Beklenmeyen hata: {str(e)}", "done": True})
+        finally:
+            gen.upstream = None
+            ModelUsage.record("chat", ollama_tier, ollama_model, time.perf_counter() - t0, ok=ok)
+
+        if gen.cancelled:
+            ChatRegistry.record_cancel(gen.cancelled, state.get("tokens", 0))
+            log.info(f"[Chat] {gen.id} cancelled ({gen.cancelled}) after {state.get('tokens', 0)} tokens")
+            yield _sse_pack({"error": "Yanıt iptal edildi. Lütfen soruyu tekrar sorun.", "done": True})
+            return
+        if ok:
+            ChatRegistry.record_finish(state.get("tokens", 0))
+        if ok and cache_key:
+            AnswerCache.store(cache_key, question, "".join(parts), cache_max)
 
         yield _sse_pack({"done": True})
 
+    threading.Thread(target=produce, args=(gen, generate()), name=f"chat-{gen.id}", daemon=True).start()
+    return _sse_response(sse_frames(gen, cancel_grace=cancel_grace))
+
+# ---------- Yardımcılar ----------
+def _sse_pack(obj: dict) -> str:
+    return f"data: {json.dumps(obj, ensure_ascii=False)}\n\n"
+
+def _sse_response(gen) -> Response:
     return Response(
-        generate(),
+        gen,
         mimetype="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -135,6 +217,13 @@ Eşleşen Yetenekler: {', '.join(matched_skills[:10])}
         }
     )
 
-# ---------- Yardımcılar ----------
-def _sse_pack(obj: dict) -> str:
-    return f"data: {json.dumps(obj, ensure_ascii=False)}\n\n"
+def _replay(answer: str, model: str, chunk_size: int = 256):
+    """Önbellekteki cevabı canlı akışla aynı SSE çerçeveleriyle yeniden oynat."""
+    for i in range(0, len(answer), chunk_size):
+        yield _sse_pack({
+            "model": model,
+            "message": {"role": "assistant", "content": answer[i:i + chunk_size]},
+            "done": False,
+            "cached": True,
+        })
+    yield _sse_pack({"done": True, "cached": True})
@@ -1,4 +1,8 @@
 from flask import Blueprint, jsonify, session, current_app as app
+from ..services.llm_client import ModelUsage
+from ..services.answer_cache import AnswerCache
+from ..services.chat_stream import ChatRegistry
+from ..services.prefetch import JobPrefetcher
 
 bp = Blueprint("status", __name__)
 
@@ -13,5 +17,11 @@ def get_status():
         "profession_confidence": prof.get("confidence", None),
         "needs_manual_profession": session.get("needs_manual_profession", True),
         "ollama_configured": True,
-        "ollama_model": app.config["OLLAMA_MODEL"]
+        "ollama_model": app.config["OLLAMA_MODEL"],
+        "ollama_small_model": app.config.get("OLLAMA_SMALL_MODEL"),
+        "model_tiers": app.config.get("OLLAMA_TASK_MODELS", {}),
+        "model_usage": ModelUsage.snapshot(),
+        "answer_cache": AnswerCache.stats() if app.config.get("CHAT_CACHE_ENABLED") else None,
+        "chat_streams": ChatRegistry.stats(),
+        "job_prefetch": JobPrefetcher.stats() if app.config.get("PREFETCH_ENABLED", True) else None
     })
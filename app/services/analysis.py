@@ -1,26 +1,18 @@
-import re
 from typing import Dict, List, Tuple, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from ..models import AnalysisResult
+from .cv_scanner import CVScanner
 
 class CVAnalyzer:
     @staticmethod
     def check_sections(cv_text: str) -> Dict[str, bool]:
-        return {
-            "Kişisel Bilgiler": bool(re.search(r"\b(kişisel|personal|contact|iletişim)\b", cv_text, re.I)),
-            "Özet/Profil":     bool(re.search(r"\b(özet|summary|profile|hakkında|about)\b", cv_text, re.I)),
-            "Deneyim":         bool(re.search(r"\b(deneyim|experience|work|career|iş)\b", cv_text, re.I)),
-            "Eğitim":          bool(re.search(r"\b(eğitim|education|university|üniversite|okul)\b", cv_text, re.I)),
-            "Yetenekler":      bool(re.search(r"\b(yetenekler|skills|teknoloji|competenc)\b", cv_text, re.I)),
-            "Sertifikalar":    bool(re.search(r"\b(sertifika|certificate|certification)\b", cv_text, re.I))
-        }
+        return CVScanner.scan(cv_text).sections
 
     @staticmethod
     def check_contact_info(cv_text: str) -> Tuple[bool, bool]:
-        phone_pattern = r"(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4,}"
-        email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        return bool(re.search(phone_pattern, cv_text)), bool(re.search(email_pattern, cv_text))
+        f = CVScanner.scan(cv_text)
+        return f.has_phone, f.has_email
 
     @staticmethod
     def calculate_similarity(text1: str, text2: str) -> float:
@@ -55,9 +47,11 @@ class CVAnalyzer:
                 coverage = len(matched) / len(job_skills)
                 missing_skills = [s for s in job_skills if s not in matched]
 
-        sections = cls.check_sections(cv_text)
+        # Bölüm/iletişim/uzunluk tek geçişte
+        features = CVScanner.scan(cv_text)
+        sections = features.sections
         section_score = sum(sections.values()) / len(sections)
-        has_phone, has_email = cls.check_contact_info(cv_text)
+        has_phone, has_email = features.has_phone, features.has_email
         contact_score = (int(has_phone) + int(has_email)) / 2
 
         ats_score = (0.40*similarity + 0.35*coverage + 0.15*section_score + 0.10*contact_score) * 100
@@ -69,7 +63,7 @@ class CVAnalyzer:
         missing_sections = [k for k,v in sections.items() if not v]
         if missing_sections: issues.append(f"📋 Eksik bölümler: {', '.join(missing_sections)}")
 
-        cv_length = len(cv_text)
+        cv_length = features.length
         if cv_length < 1000: issues.append("📄 CV çok kısa - detaylandırılması öneriliyor")
         elif cv_length > 8000: issues.append("📄 CV çok uzun - 2 sayfaya sıkıştırılması öneriliyor")
 
@@ -0,0 +1,100 @@
+# app/services/answer_cache.py
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Optional
+
+from ..utils import normalize_token
+
+_PUNCT = re.compile(r"[^\w#+. ]+")
+
+
+def normalize_question(q: str) -> str:
+    t = normalize_token(q)
+    t = _PUNCT.sub(" ", t)
+    return re.sub(r"\s+", " ", t).strip(" .")
+
+
+def text_vector(text: str) -> dict:
+    """
+    Hafif yerel metin vektörü: kelime + karakter 3-gram sayıları, L2 normalize.
+    Dış model/bağımlılık gerektirmez.
+    """
+    words = text.split()
+    feats = Counter(words)
+    padded = f" {text} "
+    feats.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    norm = math.sqrt(sum(v * v for v in feats.values())) or 1.0
+    return {k: v / norm for k, v in feats.items()}
+
+
+def cosine(a: dict, b: dict) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class AnswerCache:
+    """
+    Koçluk cevapları için anlamsal önbellek (opt-in, süreç içi).
+    Anahtar: meslek + iş ilanı hash'i + CV hash'i + eksik yetenek kümesi (bağlam).
+    Prompt CV'den alıntı içerdiğinden cevap yalnızca aynı CV'ye tekrar verilir;
+    bağlam içinde normalize soru vektörleri benzerlik eşiğiyle eşleştirilir.
+    Toplam kayıt sayısı sınırlı, en eski kullanılan (LRU) önce atılır.
+    """
+    _lock = threading.Lock()
+    _entries = OrderedDict()  # (ctx_key, norm_q) -> {"vec":..., "answer":...}
+    _hits = 0
+    _misses = 0
+
+    @staticmethod
+    def context_key(profession_name: str, job_text: str, missing_skills, cv_text: str = "") -> str:
+        job_hash = hashlib.sha1((job_text or "").encode("utf-8")).hexdigest()
+        cv_hash = hashlib.sha1((cv_text or "").encode("utf-8")).hexdigest()
+        missing = sorted({normalize_token(str(s)) for s in (missing_skills or []) if s})
+        raw = "\x1f".join([normalize_token(profession_name or ""), job_hash, cv_hash, "|".join(missing)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def lookup(cls, ctx_key: str, question: str, threshold: float = 0.9) -> Optional[str]:
+        nq = normalize_question(question)
+        if not nq:
+            return None
+        vec = text_vector(nq)
+        with cls._lock:
+            exact = cls._entries.get((ctx_key, nq))
+            if exact is not None:
+                cls._entries.move_to_end((ctx_key, nq))
+                cls._hits += 1
+                return exact["answer"]
+            best_key, best_sim = None, 0.0
+            for key, ent in cls._entries.items():
+                if key[0] != ctx_key:
+                    continue
+                sim = cosine(vec, ent["vec"])
+                if sim > best_sim:
+                    best_key, best_sim = key, sim
+            if best_key is not None and best_sim >= threshold:
+                cls._entries.move_to_end(best_key)
+                cls._hits += 1
+                return cls._entries[best_key]["answer"]
+            cls._misses += 1
+            return None
+
+    @classmethod
+    def store(cls, ctx_key: str, question: str, answer: str, max_entries: int = 500):
+        nq = normalize_question(question)
+        if not nq or not (answer or "").strip():
+            return
+        with cls._lock:
+            cls._entries[(ctx_key, nq)] = {"vec": text_vector(nq), "answer": answer}
+            cls._entries.move_to_end((ctx_key, nq))
+            while len(cls._entries) > max(1, int(max_entries)):
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            return {"entries": len(cls._entries), "hits": cls._hits, "misses": cls._misses}
@@ -0,0 +1,67 @@
+# app/services/assets.py
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+try:  # brotli opsiyonel; yoksa yalnızca gzip üretilir
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+@dataclass
+class Asset:
+    name: str          # static/ altındaki yol, örn. "js/app.js"
+    hashed: str        # parmak izli yol, örn. "js/app.3f2a1b9c0d4e.js"
+    digest: str
+    mimetype: str
+    variants: Dict[str, bytes] = field(default_factory=dict)  # encoding -> gövde
+
+
+class AssetPipeline:
+    """
+    Build adımı gerektirmeyen statik varlık hattı. Uygulama açılışında
+    static/ altındaki JS/CSS dosyalarının içerik parmak izini hesaplar ve
+    gzip (varsa brotli) varyantlarını bellekte önceden üretir.
+    """
+    EXTENSIONS = (".js", ".css")
+
+    def __init__(self, static_dir):
+        self.static_dir = Path(static_dir)
+        self.by_name: Dict[str, Asset] = {}
+        self.by_hashed: Dict[str, Asset] = {}
+
+    def build(self) -> "AssetPipeline":
+        for path in sorted(self.static_dir.rglob("*")):
+            if not path.is_file() or path.suffix not in self.EXTENSIONS:
+                continue
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            rel = path.relative_to(self.static_dir)
+            name = rel.as_posix()
+            hashed = rel.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+            mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+            variants = {"identity": data}
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gz) < len(data):
+                variants["gzip"] = gz
+            if brotli is not None:
+                br = brotli.compress(data, quality=11)
+                if len(br) < len(data):
+                    variants["br"] = br
+
+            asset = Asset(name=name, hashed=hashed, digest=digest, mimetype=mimetype, variants=variants)
+            self.by_name[name] = asset
+            self.by_hashed[hashed] = asset
+        return self
+
+    def url(self, name: str) -> Optional[str]:
+        asset = self.by_name.get(name)
+        return f"/assets/{asset.hashed}" if asset else None
+
+    def lookup(self, hashed: str) -> Optional[Asset]:
+        return self.by_hashed.get(hashed)
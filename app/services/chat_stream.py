@@ -0,0 +1,207 @@
+# app/services/chat_stream.py
+import threading
+import time
+import uuid
+from typing import Iterator, Optional, Tuple
+
+# Tarayıcının yeniden bağlanma gecikmesi (SSE 'retry'); CHAT_CANCEL_GRACE_S bundan uzun olmalı
+RETRY_MS = 10000
+
+
+class ChatGeneration:
+    """
+    Tek bir sohbet üretiminin SSE çerçeve tamponu. Üretici (arka plan
+    thread'i) çerçeve ekler; bir veya daha fazla okuyucu istenen sıra
+    numarasından itibaren tamponu okur ve üretim sürüyorsa takip eder.
+    """
+
+    def __init__(self, gen_id: str, owner: Optional[str]):
+        self.id = gen_id
+        self.owner = owner
+        self.frames = []
+        self.finished = False
+        self.created = time.time()
+        self.finished_at = None
+        self.readers = 0
+        self.cancelled = None   # iptal nedeni: "disconnect" | "superseded"
+        self.upstream = None    # Ollama yanıtı; iptalde kapatılır
+        self._cond = threading.Condition()
+
+    def attach(self):
+        with self._cond:
+            self.readers += 1
+
+    def detach(self, grace: float = 0.0):
+        """Okuyucu ayrıldı; kimse kalmadıysa (grace sonrası) üretimi iptal et."""
+        with self._cond:
+            self.readers -= 1
+            orphaned = self.readers <= 0 and not self.finished
+        if not orphaned:
+            return
+        if grace > 0:
+            timer = threading.Timer(grace, self._cancel_if_orphaned)
+            timer.daemon = True
+            timer.start()
+        else:
+            self.cancel("disconnect")
+
+    def _cancel_if_orphaned(self):
+        with self._cond:
+            orphaned = self.readers <= 0
+        if orphaned:
+            self.cancel("disconnect")
+
+    def cancel(self, reason: str) -> bool:
+        """Upstream bağlantısını hemen kapatır; Ollama üretimi durdurur."""
+        with self._cond:
+            if self.finished or self.cancelled:
+                return False
+            self.cancelled = reason
+            upstream = self.upstream
+            self._cond.notify_all()
+        if upstream is not None:
+            try:
+                upstream.close()
+            except Exception:
+                pass
+        return True
+
+    def append(self, frame: str):
+        with self._cond:
+            self.frames.append(frame)
+            self._cond.notify_all()
+
+    def finish(self):
+        with self._cond:
+            self.finished = True
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def follow(self, start: int = 0, keepalive: float = 15.0) -> Iterator[Tuple[Optional[int], str]]:
+        """
+        (seq, frame) çiftleri üret. Uzun beklemelerde (None, ": keepalive")
+        döner; üretim bitip tüm çerçeveler okununca sonlanır.
+        """
+        seq = max(0, start)
+        while True:
+            with self._cond:
+                if seq >= len(self.frames) and not self.finished:
+                    self._cond.wait(keepalive)
+                pending = self.frames[seq:]
+                finished = self.finished
+            if pending:
+                for frame in pending:
+                    yield seq, frame
+                    seq += 1
+            elif finished:
+                return
+            else:
+                yield None, ": keepalive\n\n"
+
+
+class ChatRegistry:
+    """
+    Süreç içi üretim kaydı. Biten üretimler ttl saniye boyunca tutulur;
+    bu sürede Last-Event-ID ile gelen yeniden bağlantılar tampondan devam eder.
+    Aynı oturumda yeni soru, süren önceki üretimi iptal eder (supersede).
+    """
+    _lock = threading.Lock()
+    _gens = {}
+    _active = {}  # owner -> gen_id
+    _stats = {
+        "completed": 0,
+        "completed_tokens": 0,
+        "cancelled_disconnect": 0,
+        "cancelled_superseded": 0,
+        "cancelled_tokens": 0,
+        "est_tokens_saved": 0,
+    }
+
+    @classmethod
+    def _purge(cls, ttl: float):
+        now = time.time()
+        expired = [gid for gid, g in cls._gens.items()
+                   if g.finished and now - g.finished_at > ttl]
+        for gid in expired:
+            del cls._gens[gid]
+        for owner in [o for o, gid in cls._active.items() if gid not in cls._gens]:
+            del cls._active[owner]
+
+    @classmethod
+    def create(cls, owner: Optional[str], ttl: float = 120.0) -> ChatGeneration:
+        gen = ChatGeneration(uuid.uuid4().hex[:16], owner)
+        with cls._lock:
+            cls._purge(ttl)
+            prev = cls._gens.get(cls._active.get(owner)) if owner else None
+            cls._gens[gen.id] = gen
+            if owner:
+                cls._active[owner] = gen.id
+        if prev is not None:
+            prev.cancel("superseded")
+        return gen
+
+    @classmethod
+    def record_finish(cls, tokens: int):
+        with cls._lock:
+            cls._stats["completed"] += 1
+            cls._stats["completed_tokens"] += int(tokens)
+
+    @classmethod
+    def record_cancel(cls, reason: str, tokens: int):
+        """İptal sayacı; tasarruf tahmini = ortalama tamamlanmış cevap uzunluğu - üretilen."""
+        with cls._lock:
+            key = f"cancelled_{reason}"
+            cls._stats[key] = cls._stats.get(key, 0) + 1
+            cls._stats["cancelled_tokens"] += int(tokens)
+            done = cls._stats["completed"]
+            if done:
+                avg = cls._stats["completed_tokens"] / done
+                cls._stats["est_tokens_saved"] += max(0, int(avg - tokens))
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            out = dict(cls._stats)
+            out["buffered"] = len(cls._gens)
+            out["running"] = sum(1 for g in cls._gens.values() if not g.finished)
+            return out
+
+    @classmethod
+    def resume(cls, last_event_id: str, owner: Optional[str], ttl: float = 120.0) -> Optional[Tuple[ChatGeneration, int]]:
+        """'<gen_id>:<seq>' biçimindeki Last-Event-ID'den (üretim, başlangıç sırası) döndür."""
+        gen_id, _, seq = (last_event_id or "").partition(":")
+        if not gen_id or not seq.isdigit():
+            return None
+        with cls._lock:
+            cls._purge(ttl)
+            gen = cls._gens.get(gen_id)
+        if gen is None or gen.owner != owner:
+            return None
+        return gen, int(seq) + 1
+
+
+def sse_frames(gen: ChatGeneration, start: int = 0, cancel_grace: float = 0.0) -> Iterator[str]:
+    """
+    Tampondaki çerçeveleri 'id: <gen>:<seq>' satırıyla istemciye aktar.
+    İstemci bağlantıyı kapattığında WSGI sunucusu üreteci kapatır (GeneratorExit);
+    son okuyucu ayrılınca üretim iptal edilir.
+    """
+    gen.attach()
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        for seq, frame in gen.follow(start):
+            if seq is None:
+                yield frame
+            else:
+                yield f"id: {gen.id}:{seq}\n{frame}"
+    finally:
+        gen.detach(cancel_grace)
+
+
+def produce(gen: ChatGeneration, frames: Iterator[str]):
+    """Arka plan thread'i: üretici çerçevelerini tampona yaz."""
+    try:
+        for frame in frames:
+            gen.append(frame)
+    finally:
+        gen.finish()
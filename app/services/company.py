@@ -1,10 +1,11 @@
 from typing import Dict
 from .llm_client import LLMClient
-from ..utils import extract_json
+
+COMPANY_KEYS = ("company", "role_title", "industry", "location")
 
 class CompanyExtractor:
     @staticmethod
-    def parse(job_text: str) -> Dict[str, str]:
+    def parse(job_text: str, deadline=None) -> Dict[str, str]:
         system = "You extract company metadata from job ads. Respond with JSON only."
         user = f"""
 From the job ad text, extract company metadata. If unknown, set null.
@@ -20,11 +21,13 @@ Schema:
 TEXT:
 {job_text[:4000]}
 """
-        content = LLMClient.chat(
+        obj = LLMClient.chat_json(
+            "company",
             [{"role":"system","content":system},{"role":"user","content":user}],
-            options={"temperature":0.0}
+            accept=lambda o: any(k in o for k in COMPANY_KEYS),
+            options={"temperature":0.0},
+            deadline=deadline
         )
-        obj = extract_json(content)
         return {
             "company": obj.get("company"),
             "role_title": obj.get("role_title"),
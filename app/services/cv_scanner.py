@@ -0,0 +1,77 @@
+# app/services/cv_scanner.py
+"""
+CV metni için ortak özellik tarayıcı: bölüm başlıkları, telefon, e-posta ve
+uzunluk tek çağrıda çıkarılır.
+
+Sonuçlar eski `re.search(r"\b(...)\b", text, re.I)` aramalarıyla birebir
+aynıdır, ama her biri metni baştan regex ile taramaz:
+- metin bir kez küçük harfe indirilir (re.I'nin i/İ/ı ve s/ſ eşdeğerlikleri dahil),
+  bölüm anahtar kelimeleri str.find + kelime sınırı kontrolüyle aranır;
+- e-posta yalnızca '@' konumlarında, önceden derlenmiş alan adı deseniyle doğrulanır;
+- telefon, önceden derlenmiş tek bir desenle aranır.
+"""
+import re
+
+from ..models import CVFeatures
+
+# Bölüm adı -> anahtar kelimeler (tam kelime, büyük/küçük harf duyarsız)
+SECTIONS = (
+    ("Kişisel Bilgiler", ("kişisel", "personal", "contact", "iletişim")),
+    ("Özet/Profil",      ("özet", "summary", "profile", "hakkında", "about")),
+    ("Deneyim",          ("deneyim", "experience", "work", "career", "iş")),
+    ("Eğitim",           ("eğitim", "education", "university", "üniversite", "okul")),
+    ("Yetenekler",       ("yetenekler", "skills", "teknoloji", "competenc")),
+    ("Sertifikalar",     ("sertifika", "certificate", "certification")),
+)
+
+# (\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4,} ile aynı varlık koşulu:
+# opsiyonel önekler ve \d{4,} kuyruğu eşleşmenin olup olmadığını değiştirmez.
+_PHONE = re.compile(r"\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+# [a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,} : '@' sonrası kısım
+_EMAIL_DOMAIN = re.compile(r"[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_EMAIL_LOCAL = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+
+
+def _fold(text: str) -> str:
+    """re.I ile eşdeğer küçük harf: lower()'ın re.I'den farklı davrandığı harfler önce eşlenir."""
+    return text.replace("İ", "i").replace("ı", "i").replace("ſ", "s").lower()
+
+
+def _is_word(c: str) -> bool:
+    # re'nin Unicode \w tanımı
+    return c.isalnum() or c == "_"
+
+
+def _has_word(text: str, word: str) -> bool:
+    """\\bword\\b: kelime metinde, iki yanı da kelime karakteri olmadan geçiyor mu."""
+    n, k = len(text), len(word)
+    i = text.find(word)
+    while i != -1:
+        if (i == 0 or not _is_word(text[i - 1])) and (i + k == n or not _is_word(text[i + k])):
+            return True
+        i = text.find(word, i + 1)
+    return False
+
+
+def _has_email(text: str) -> bool:
+    i = text.find("@")
+    while i != -1:
+        if i > 0 and text[i - 1] in _EMAIL_LOCAL and _EMAIL_DOMAIN.match(text, i + 1):
+            return True
+        i = text.find("@", i + 1)
+    return False
+
+
+class CVScanner:
+    @staticmethod
+    def scan(cv_text: str) -> CVFeatures:
+        text = cv_text or ""
+        folded = _fold(text)
+        return CVFeatures(
+            sections={
+                name: any(_has_word(folded, w) for w in words) for name, words in SECTIONS
+            },
+            has_phone=_PHONE.search(text) is not None,
+            has_email=_has_email(text),
+            length=len(text),
+        )
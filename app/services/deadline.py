@@ -0,0 +1,61 @@
+# app/services/deadline.py
+import math
+import time
+
+import requests
+
+
+class DeadlineExceeded(Exception):
+    """İstek zaman bütçesi bitti; aşama deterministik yola düşmeli."""
+
+
+class Deadline:
+    """
+    İstek başına zaman bütçesi. Her aşama kendi üst sınırıyla kalan süreden
+    küçük olanı zaman aşımı olarak kullanır. seconds <= 0 ise sınırsızdır.
+    """
+
+    def __init__(self, seconds: float = 0.0, floor: float = 1.0):
+        self.budget = float(seconds or 0.0)
+        self.floor = floor
+        self.started = time.monotonic()
+        self.expires = self.started + self.budget if self.budget > 0 else None
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires is not None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        if self.expires is None:
+            return math.inf
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() < self.floor
+
+    def timeout(self, cap) -> float:
+        """Aşama zaman aşımı: min(cap, kalan). Kalan süre floor'un altındaysa DeadlineExceeded."""
+        rem = self.remaining()
+        if rem < self.floor:
+            raise DeadlineExceeded(f"deadline exceeded after {self.elapsed():.1f}s")
+        return min(float(cap), rem) if cap else rem
+
+
+def stage_timeout(deadline, cap):
+    """deadline yoksa cap'i aynen döndür."""
+    return deadline.timeout(cap) if deadline is not None else cap
+
+
+def is_deadline_error(e: Exception, deadline=None) -> bool:
+    """
+    Aşama bütçe yüzünden mi düştü? Zaman aşımı yalnızca sınırlı bir deadline
+    varken bütçe kaynaklı sayılır; aksi halde (batch, prefetch, bütçe 0)
+    geçici bir hatadır ve çağırana iletilmelidir.
+    """
+    if isinstance(e, DeadlineExceeded):
+        return True
+    return (isinstance(e, requests.exceptions.Timeout)
+            and deadline is not None and deadline.bounded)
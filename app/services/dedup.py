@@ -0,0 +1,153 @@
+# app/services/dedup.py
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from ..utils import normalize_token
+
+_MERSENNE = np.uint64((1 << 32) - 5)  # 32-bit asal; a*x taşmadan uint64'e sığar
+_WORD = re.compile(r"\w+", re.U)
+
+
+class MinHasher:
+    """Kelime shingle'ları üzerinden deterministik MinHash imzası."""
+
+    def __init__(self, num_perm: int = 128, shingle: int = 5, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.a = rng.randint(1, int(_MERSENNE), size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, int(_MERSENNE), size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        words = _WORD.findall(normalize_token(text))
+        k = self.shingle
+        if len(words) < k:
+            grams = [" ".join(words)] if words else []
+        else:
+            grams = [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+        # crc32 süreçler arası sabit -> kalıcı indeksle uyumlu
+        return np.fromiter({zlib.crc32(g.encode("utf-8")) for g in grams}, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.signature_of(self.shingles(text))
+
+    def signature_of(self, x: np.ndarray) -> np.ndarray:
+        if x.size == 0:
+            return np.full(self.num_perm, _MERSENNE, dtype=np.uint64)
+        hv = (np.outer(self.a, x) + self.b[:, None]) % _MERSENNE
+        return hv.min(axis=1)
+
+    @staticmethod
+    def jaccard(sig1: np.ndarray, sig2: np.ndarray) -> float:
+        return float(np.mean(sig1 == sig2))
+
+
+class JobDedupIndex:
+    """
+    İş ilanı metinleri için kalıcı MinHash/LSH indeksi (SQLite).
+    Aynı ilanın farklı URL/yeniden yayın varyantları için önceki çıkarım
+    sonuçları (job skills, company meta) yeniden kullanılır.
+    Kayıt sayısı max_entries ile sınırlı; en uzun süredir kullanılmayan atılır.
+    min_shingles'tan az shingle üreten kısa metinler (çerez duvarı, "JavaScript'i
+    etkinleştirin" sayfaları vb.) birbirine Jaccard 1.0 ile eşleşeceğinden
+    indekslenmez ve aranmaz.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.8, num_perm: int = 128,
+                 bands: int = 16, max_entries: int = 5000, min_shingles: int = 50):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.path = path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.min_shingles = max(1, min_shingles)
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._lock = threading.Lock()
+        with self._conn() as db:
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT, sig BLOB NOT NULL, payload TEXT NOT NULL,
+                    created REAL NOT NULL, last_used REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS bands (
+                    band INTEGER NOT NULL, bucket INTEGER NOT NULL, doc_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_bands ON bands(band, bucket);
+                CREATE INDEX IF NOT EXISTS ix_bands_doc ON bands(doc_id);
+                CREATE INDEX IF NOT EXISTS ix_docs_used ON docs(last_used);
+            """)
+
+    @contextmanager
+    def _conn(self):
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            with db:  # commit / rollback
+                yield db
+        finally:
+            db.close()
+
+    def _buckets(self, sig: np.ndarray):
+        r = self.rows
+        return [(b, zlib.crc32(sig[b * r:(b + 1) * r].tobytes())) for b in range(self.bands)]
+
+    def _signature(self, text: str) -> Optional[np.ndarray]:
+        """Yeterince uzun metinler için imza; kısa metinler için None."""
+        x = self.hasher.shingles(text)
+        if x.size < self.min_shingles:
+            return None
+        return self.hasher.signature_of(x)
+
+    def lookup(self, text: str) -> Optional[dict]:
+        """Eşik üstü en benzer kaydı döndür: {"url", "similarity", "payload"} ya da None."""
+        sig = self._signature(text)
+        if sig is None:
+            return None
+        buckets = self._buckets(sig)
+        with self._lock, self._conn() as db:
+            cand = set()
+            for band, bucket in buckets:
+                cand.update(row[0] for row in db.execute(
+                    "SELECT doc_id FROM bands WHERE band=? AND bucket=?", (band, bucket)))
+            best, best_sim = None, 0.0
+            for doc_id in cand:
+                row = db.execute("SELECT id, url, sig, payload FROM docs WHERE id=?", (doc_id,)).fetchone()
+                if not row:
+                    continue
+                sim = MinHasher.jaccard(sig, np.frombuffer(row[2], dtype=np.uint64))
+                if sim > best_sim:
+                    best, best_sim = row, sim
+            if best is None or best_sim < self.threshold:
+                return None
+            db.execute("UPDATE docs SET last_used=? WHERE id=?", (time.time(), best[0]))
+            return {"url": best[1], "similarity": round(best_sim, 3), "payload": json.loads(best[3])}
+
+    def add(self, text: str, url: str, payload: dict):
+        sig = self._signature(text)
+        if sig is None:
+            return
+        now = time.time()
+        with self._lock, self._conn() as db:
+            cur = db.execute(
+                "INSERT INTO docs (url, sig, payload, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (url, sig.tobytes(), json.dumps(payload, ensure_ascii=False), now, now))
+            doc_id = cur.lastrowid
+            db.executemany("INSERT INTO bands (band, bucket, doc_id) VALUES (?, ?, ?)",
+                           [(b, h, doc_id) for b, h in self._buckets(sig)])
+            (count,) = db.execute("SELECT COUNT(*) FROM docs").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                old = [r[0] for r in db.execute(
+                    "SELECT id FROM docs ORDER BY last_used ASC LIMIT ?", (overflow,))]
+                db.executemany("DELETE FROM bands WHERE doc_id=?", [(i,) for i in old])
+                db.executemany("DELETE FROM docs WHERE id=?", [(i,) for i in old])
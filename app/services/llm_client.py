@@ -1,14 +1,63 @@
+import threading
+import time
 import requests
-from flask import current_app as app
+from ..config import current_config, current_logger
+from ..utils import extract_json
+from .deadline import DeadlineExceeded, stage_timeout
+
+# Görev -> tier eşlemesi için bilinen görevler
+TASKS = ("company", "profession", "skills", "align", "chat")
+
+
+class ModelUsage:
+    """
+    Tier bazlı kullanım sayaçları (süreç içi). Küçük/büyük model ayrımını
+    ayarlayabilmek için çağrı, hata, yükseltme (escalation) ve gecikme tutulur.
+    """
+    _lock = threading.Lock()
+    _stats = {}
+
+    @classmethod
+    def record(cls, task: str, tier: str, model: str, elapsed: float, ok: bool = True, escalated: bool = False):
+        with cls._lock:
+            st = cls._stats.setdefault(task, {}).setdefault(tier, {
+                "model": model, "calls": 0, "failures": 0, "escalations": 0, "total_ms": 0.0,
+            })
+            st["model"] = model
+            st["calls"] += 1
+            st["total_ms"] += elapsed * 1000.0
+            if not ok:
+                st["failures"] += 1
+            if escalated:
+                st["escalations"] += 1
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        with cls._lock:
+            out = {}
+            for task, tiers in cls._stats.items():
+                out[task] = {}
+                for tier, st in tiers.items():
+                    calls = st["calls"] or 1
+                    out[task][tier] = {
+                        "model": st["model"],
+                        "calls": st["calls"],
+                        "failures": st["failures"],
+                        "escalations": st["escalations"],
+                        "escalation_rate": round(st["escalations"] / calls, 3),
+                        "avg_ms": round(st["total_ms"] / calls, 1),
+                    }
+            return out
+
 
 class LLMClient:
     @staticmethod
     def _base() -> str:
-        return (app.config.get("OLLAMA_BASE_URL") or "http://localhost:11434").rstrip("/")
+        return (current_config().get("OLLAMA_BASE_URL") or "http://localhost:11434").rstrip("/")
 
     @staticmethod
-    def _timeout(t=None) -> int:
-        return int(t or app.config.get("OLLAMA_TIMEOUT", 60))
+    def _timeout(t=None) -> float:
+        return float(t or current_config().get("OLLAMA_TIMEOUT", 60))
 
     @staticmethod
     def _post(path: str, payload: dict, stream: bool = False, timeout=None):
@@ -16,12 +65,44 @@ class LLMClient:
         return requests.post(url, json=payload, stream=stream, timeout=LLMClient._timeout(timeout))
 
     @staticmethod
-    def chat(messages, options=None, timeout=None, format_json: bool = False) -> str:
+    def large_model() -> str:
+        return current_config().get("OLLAMA_MODEL", "qwen2.5:7b-instruct")
+
+    @staticmethod
+    def resolve(task=None) -> tuple:
+        """
+        Görev için (tier, model) çöz. OLLAMA_TASK_MODELS değerleri 'small',
+        'large' ya da doğrudan bir Ollama model adı olabilir. TASKS dışındaki
+        görevler büyük modele düşer. Doğrudan verilen model adı büyük/küçük
+        modelle aynı değilse kullanım sayaçlarında kendi adıyla (tier) tutulur.
+        """
+        large = LLMClient.large_model()
+        if task and task not in TASKS:
+            current_logger().warning(f"[LLM] unknown task '{task}'; using large model (known: {', '.join(TASKS)})")
+            return "large", large
+        choice = (current_config().get("OLLAMA_TASK_MODELS") or {}).get(task) if task else None
+        small = current_config().get("OLLAMA_SMALL_MODEL")
+        if not choice or choice == "large":
+            return "large", large
+        if choice == "small":
+            return ("small", small) if small and small != large else ("large", large)
+        if choice == large:
+            return "large", large
+        if choice == small:
+            return "small", small
+        return choice, choice
+
+    @staticmethod
+    def model_for(task=None) -> str:
+        return LLMClient.resolve(task)[1]
+
+    @staticmethod
+    def chat(messages, options=None, timeout=None, format_json: bool = False, model=None) -> str:
         """
         Tek seferlik yanıt (stream değil). format_json=True ise Ollama'ya 'format':'json' gönderilir.
         """
         payload = {
-            "model": app.config.get("OLLAMA_MODEL", "qwen2.5:7b-instruct"),
+            "model": model or LLMClient.large_model(),
             "messages": messages,
             "stream": False,
             "options": {
@@ -40,6 +121,54 @@ class LLMClient:
         data = resp.json()
         return data.get("message", {}).get("content", "")
 
+    @staticmethod
+    def chat_json(task: str, messages, accept=None, options=None, timeout=None, format_json: bool = False,
+                  deadline=None) -> dict:
+        """
+        Görev modeline göre JSON yanıt al. Küçük modelin çıktısı parse edilemezse
+        ya da accept(obj) False dönerse otomatik olarak büyük modele yükseltilir.
+        Büyük modelin çıktısı doğrulanmaz; parse hatası çağırana iletilir.
+        deadline verilirse her çağrı kalan bütçeyle sınırlanır; yükseltmeye süre
+        kalmadıysa küçük modelin (doğrulanmamış) JSON'u döndürülür.
+        """
+        tier, model = LLMClient.resolve(task)
+        large = LLMClient.large_model()
+        cap = LLMClient._timeout(timeout)
+
+        if model != large:
+            t0 = time.perf_counter()
+            obj = None
+            try:
+                obj = extract_json(LLMClient.chat(messages, options=options, timeout=stage_timeout(deadline, cap),
+                                                  format_json=format_json, model=model))
+                ok = isinstance(obj, dict) and (accept is None or bool(accept(obj)))
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                current_logger().info(f"[LLM] {task}: small model '{model}' failed ({e}); escalating")
+                obj, ok = None, False
+            escalate = not ok and current_config().get("OLLAMA_ESCALATE", True)
+            if escalate and deadline is not None and deadline.expired():
+                escalate = False
+                if obj is None:
+                    ModelUsage.record(task, tier, model, time.perf_counter() - t0, ok=False)
+                    raise DeadlineExceeded(f"no budget left to escalate '{task}'")
+            ModelUsage.record(task, tier, model, time.perf_counter() - t0, ok=ok, escalated=escalate)
+            if ok or not escalate:
+                if obj is None:
+                    raise ValueError(f"LLM output rejected for task '{task}'")
+                return obj
+
+        t0 = time.perf_counter()
+        try:
+            obj = extract_json(LLMClient.chat(messages, options=options, timeout=stage_timeout(deadline, cap),
+                                              format_json=format_json, model=large))
+        except Exception:
+            ModelUsage.record(task, "large", large, time.perf_counter() - t0, ok=False)
+            raise
+        ModelUsage.record(task, "large", large, time.perf_counter() - t0)
+        return obj
+
     @staticmethod
     def chat_stream(messages, options=None, timeout=None):
         """
@@ -47,7 +176,7 @@ class LLMClient:
         bu yüzden burada format_json yok.)
         """
         payload = {
-            "model": app.config.get("OLLAMA_MODEL", "qwen2.5:7b-instruct"),
+            "model": LLMClient.model_for("chat"),
             "messages": messages,
             "stream": True,
             "options": {
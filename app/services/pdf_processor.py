@@ -1,4 +1,4 @@
-import re, fitz
+import fitz
 
 class PDFProcessor:
     @staticmethod
@@ -10,4 +10,5 @@ class PDFProcessor:
             if t.strip():
                 texts.append(t)
         doc.close()
-        return re.sub(r"\s+", " ", " ".join(texts)).strip()
+        # Boşlukları tek geçişte sadeleştir (re.sub(r"\s+", " ") + strip ile aynı sonuç)
+        return " ".join(" ".join(texts).split())
@@ -0,0 +1,219 @@
+# app/services/pipeline.py
+"""
+/api/analyze ve batch CLI'ın paylaştığı analiz adımları.
+Flask request context gerektirmez.
+
+Her aşama opsiyonel bir Deadline alır; bütçe biterse (veya sınırlı bir
+bütçe altında aşama zaman aşımına uğrarsa) mevcut deterministik yola
+düşülür ve aşama adı `degraded` listesine eklenir. Deadline yoksa zaman
+aşımları hata olarak yükseltilir.
+"""
+from .company import CompanyExtractor
+from .profession import ProfessionDetector
+from .skills import SkillExtractor, SkillAligner
+from .analysis import CVAnalyzer
+from .deadline import is_deadline_error
+from ..models import ProfessionProfile
+from ..config import current_logger
+from ..utils import normalize_token
+
+# ---------------- helpers ----------------
+def coerce_extract_result(x):
+    """
+    SkillExtractor.extract bazen list, bazen dict dönebilir.
+    Her durumda şu şemaya indir:
+    {"skills": [...], "alias_map": {...}, "noise": [...]}
+    """
+    if isinstance(x, dict):
+        skills = x.get("skills") or []
+        alias_map = x.get("alias_map") or {}
+        noise = x.get("noise") or []
+    elif isinstance(x, list):
+        skills, alias_map, noise = x, {}, []
+    else:
+        skills, alias_map, noise = [], {}, []
+
+    # uniq + trim (normalize ederek benzersizleştir)
+    seen, out = set(), []
+    for s in skills:
+        t = str(s).strip()
+        n = normalize_token(t)
+        if n and n not in seen:
+            seen.add(n)
+            out.append(t)
+    return {"skills": out, "alias_map": alias_map, "noise": noise}
+
+def simple_align(job_skills, cv_skills):
+    """
+    LLM hizalama başarısız olursa devreye giren basit eşleme.
+    Normalizasyon üzerine set kesişimi/diff.
+    """
+    j_norm = { normalize_token(s): s for s in job_skills }
+    c_norm = { normalize_token(s): s for s in cv_skills }
+
+    matched_norm = set(j_norm) & set(c_norm)
+    missing_norm = set(j_norm) - set(c_norm)
+
+    matched = [j_norm[n] for n in sorted(matched_norm)]
+    missing = [j_norm[n] for n in sorted(missing_norm)]
+
+    return {
+        "matched": matched,
+        "missing": missing,
+        "job_canon": list(j_norm.values()),
+        "cv_canon": list(c_norm.values()),
+    }
+
+def final_consistency(job_canon, cv_canon, matched, missing):
+    """
+    LLM'den gelen matched/missing listelerini normalize ederek yeniden üret
+    ve çakışma varsa düzelt (aynı skill hem matched hem missing olmayacak).
+    """
+    j_norm = { normalize_token(s): s for s in job_canon }
+    c_norm = { normalize_token(s): s for s in cv_canon }
+
+    matched_norm = set(j_norm) & set(c_norm)
+    # missing = job - cv
+    missing_norm = set(j_norm) - set(c_norm)
+
+    matched_fixed = [j_norm[n] for n in sorted(matched_norm)]
+    missing_fixed = [j_norm[n] for n in sorted(missing_norm)]
+
+    return matched_fixed, missing_fixed
+
+# ---------------- stages ----------------
+def _degrade(degraded, stage: str, e: Exception):
+    current_logger().warning(f"[Deadline] {stage} degraded: {e}")
+    if degraded is not None and stage not in degraded:
+        degraded.append(stage)
+
+def job_side(job_description: str, job_url: str, dedup=None, deadline=None, degraded=None,
+             should_stop=None):
+    """
+    İş ilanı tarafı: şirket metası + ilan yetenekleri.
+    dedup (JobDedupIndex) verilirse yakın kopya ilanların sonuçları yeniden kullanılır.
+    should_stop() True dönerse (ör. iptal edilen prefetch) kalan LLM çağrıları
+    ve dedup kaydı atlanır; boş yetenek listesi döner.
+    Döner: (company_meta, job_ex, duplicate|None)
+    """
+    log = current_logger()
+    duplicate = None
+    if dedup:
+        try:
+            duplicate = dedup.lookup(job_description)
+        except Exception as e:
+            log.warning(f"[JobDedup] lookup failed: {e}")
+
+    if duplicate:
+        log.info(f"[JobDedup] near-duplicate of {duplicate['url']} (sim={duplicate['similarity']})")
+        company_meta = duplicate["payload"].get("company_meta") or {}
+        job_ex = coerce_extract_result(duplicate["payload"].get("job_ex"))
+        return company_meta, job_ex, duplicate
+
+    # Şirket/persona (opsiyonel)
+    try:
+        company_meta = CompanyExtractor.parse(job_description, deadline=deadline) or {}
+    except Exception as e:
+        if is_deadline_error(e, deadline):
+            _degrade(degraded, "company", e)
+        company_meta = {}
+
+    if should_stop and should_stop():
+        return company_meta, coerce_extract_result([]), None
+
+    try:
+        job_ex = coerce_extract_result(SkillExtractor.extract(job_description, deadline=deadline))
+    except Exception as e:
+        if not is_deadline_error(e, deadline):
+            raise
+        _degrade(degraded, "job_skills", e)
+        return company_meta, coerce_extract_result([]), None
+
+    if dedup and job_ex["skills"] and not (should_stop and should_stop()):
+        try:
+            dedup.add(job_description, job_url, {"company_meta": company_meta, "job_ex": job_ex})
+        except Exception as e:
+            log.warning(f"[JobDedup] add failed: {e}")
+    return company_meta, job_ex, None
+
+def cv_side(cv_content: str, deadline=None, degraded=None):
+    """
+    CV tarafı: meslek tespiti + CV yetenekleri. Döner: (profession, conf, cv_ex)
+    Süre biterse meslek 'unknown' (manuel giriş istenir), cv_ex None olur.
+    """
+    try:
+        profession, conf = ProfessionDetector.detect(cv_content, deadline=deadline)
+    except Exception as e:
+        if not is_deadline_error(e, deadline):
+            raise
+        _degrade(degraded, "profession", e)
+        profession, conf = ProfessionProfile(
+            name="unknown", display_name="Bilinmiyor", keywords=[], technologies=[],
+            description="Meslek tespit edilemedi"
+        ), 0.0
+
+    try:
+        cv_ex = coerce_extract_result(SkillExtractor.extract(cv_content, deadline=deadline))
+    except Exception as e:
+        if not is_deadline_error(e, deadline):
+            raise
+        _degrade(degraded, "cv_skills", e)
+        cv_ex = None
+    return profession, conf, cv_ex
+
+def score_pair(job_description: str, cv_content: str, job_ex: dict, cv_ex, deadline=None, degraded=None) -> dict:
+    """
+    Yetenek hizalama + ATS skoru. cv_ex None ise (CV yetenekleri alınamadı)
+    analyze_ats_score'un metin içi naif kapsama hesabı kullanılır.
+    """
+    if cv_ex is None:
+        analysis = CVAnalyzer.analyze_ats_score(
+            job_description=job_description,
+            cv_text=cv_content,
+            job_skills=job_ex["skills"],
+        )
+        missing = list(analysis.missing)
+        matched = [s for s in job_ex["skills"] if s not in missing]
+        return {
+            "job_canon": job_ex["skills"],
+            "cv_canon": [],
+            "matched": matched,
+            "missing": missing,
+            "coverage": analysis.coverage,
+            "analysis": analysis,
+        }
+
+    # Hizalama (LLM -> fallback)
+    try:
+        alignment = SkillAligner.align(job_ex["skills"], cv_ex["skills"], deadline=deadline)
+    except Exception:
+        alignment = simple_align(job_ex["skills"], cv_ex["skills"])
+    if alignment.get("fallback") and deadline is not None and deadline.expired():
+        _degrade(degraded, "align", "deadline")
+
+    job_canon = alignment.get("job_canon") or job_ex["skills"]
+    cv_canon  = alignment.get("cv_canon")  or cv_ex["skills"]
+    matched   = alignment.get("matched")   or []
+    missing   = alignment.get("missing")   or []
+
+    # 🔒 Son tutarlılık düzeltmesi: normalize kesişim/fark
+    matched, missing = final_consistency(job_canon, cv_canon, matched, missing)
+
+    coverage = (len(matched) / max(1, len(job_canon))) if job_canon else 0.0
+
+    # ATS skor (hizalanmış listelerle)
+    analysis = CVAnalyzer.analyze_ats_score(
+        job_description=job_description,
+        cv_text=cv_content,
+        job_skills=job_canon,
+        matched_skills=matched,
+        missing_skills_input=missing
+    )
+    return {
+        "job_canon": job_canon,
+        "cv_canon": cv_canon,
+        "matched": matched,
+        "missing": missing,
+        "coverage": coverage,
+        "analysis": analysis,
+    }
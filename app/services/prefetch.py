@@ -0,0 +1,209 @@
+# app/services/prefetch.py
+import queue
+import threading
+import time
+from typing import Optional
+
+from .scraper import WebScraper
+from .pipeline import job_side
+
+
+class PrefetchJob:
+    """
+    Bir oturumun tek bir ilan URL'si için arka planda yürüyen iş ilanı tarafı
+    (scrape + şirket metası + ilan yetenekleri).
+    """
+
+    def __init__(self, owner: str, url: str, app, dedup=None):
+        self.owner = owner
+        self.url = url
+        self.app = app
+        self.dedup = dedup
+        self.status = "queued"     # queued | running | done | failed | cancelled
+        self.result = None         # (job_description, company_meta, job_ex, duplicate)
+        self.error = None
+        self.degraded = []         # job_side'ın yedek yola düştüğü aşamalar
+        self.created = time.time()
+        self.finished_at = None
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.status == "cancelled"
+
+    def _transition(self, status: str, final: bool = False) -> bool:
+        """İptal edilmiş ya da bitmiş işin durumu değişmez."""
+        with self._lock:
+            if self.done.is_set():
+                return False
+            self.status = status
+            if final:
+                self.finished_at = time.time()
+                self.done.set()
+            return True
+
+    def cancel(self) -> bool:
+        """Kuyruktaki iş hiç başlamaz; süren iş aşama aralarında bırakılır."""
+        return self._transition("cancelled", final=True)
+
+    def run(self):
+        if not self._transition("running"):
+            return
+        try:
+            with self.app.app_context():
+                job_description = WebScraper.fetch_job_description(self.url)
+                if self.cancelled:
+                    return
+                company_meta, job_ex, duplicate = job_side(
+                    job_description, self.url, self.dedup, degraded=self.degraded,
+                    should_stop=lambda: self.cancelled
+                )
+            self.result = (job_description, company_meta, job_ex, duplicate)
+            self._transition("done", final=True)
+        except Exception as e:
+            self.error = str(e)
+            self._transition("failed", final=True)
+
+
+class JobPrefetcher:
+    """
+    Oturum başına spekülatif iş ilanı analizi (süreç içi). Kullanıcı URL'yi
+    girince iş kuyruğa alınır; /api/analyze aynı oturum + URL için biten ya da
+    süren sonucu devralır. Oturumda URL değişirse önceki iş iptal edilir.
+    Kuyruk sınırlıdır; doluysa yeni istek reddedilir (analiz normal yoldan yapılır).
+    """
+    _lock = threading.Lock()
+    _jobs = {}  # owner -> PrefetchJob
+    _queue = None
+    _workers = []
+    _stats = {
+        "submitted": 0,
+        "rejected": 0,
+        "cancelled": 0,
+        "hits": 0,
+        "waited_hits": 0,
+        "misses": 0,
+        "failed": 0,
+    }
+
+    @classmethod
+    def _ensure_workers(cls, workers: int, queue_size: int):
+        # Thread'ler ilk kullanımda başlatılır (gunicorn preload'da fork sonrası)
+        if cls._queue is None:
+            cls._queue = queue.Queue(maxsize=max(1, queue_size))
+        cls._workers = [t for t in cls._workers if t.is_alive()]
+        for i in range(len(cls._workers), max(1, workers)):
+            t = threading.Thread(target=cls._worker, name=f"prefetch-{i}", daemon=True)
+            t.start()
+            cls._workers.append(t)
+
+    @classmethod
+    def _worker(cls):
+        while True:
+            job = cls._queue.get()
+            try:
+                job.run()
+                if job.status == "failed":
+                    with cls._lock:
+                        cls._stats["failed"] += 1
+            finally:
+                cls._queue.task_done()
+
+    @classmethod
+    def _purge(cls, ttl: float):
+        now = time.time()
+        for owner in [o for o, j in cls._jobs.items()
+                      if j.done.is_set() and now - j.finished_at > ttl]:
+            del cls._jobs[owner]
+
+    @classmethod
+    def submit(cls, owner: str, url: str, app, dedup=None, workers: int = 2,
+               queue_size: int = 16, ttl: float = 300.0) -> Optional[PrefetchJob]:
+        """
+        owner için url'yi önceden analiz etmeye başla. Aynı URL zaten kuyrukta,
+        sürüyor ya da bitmişse mevcut iş döner. Kuyruk doluysa None.
+        """
+        with cls._lock:
+            cls._purge(ttl)
+            prev = cls._jobs.get(owner)
+            if prev is not None and prev.url == url and prev.status in ("queued", "running", "done"):
+                return prev
+            cls._ensure_workers(workers, queue_size)
+            job = PrefetchJob(owner, url, app, dedup)
+            try:
+                cls._queue.put_nowait(job)
+            except queue.Full:
+                cls._stats["rejected"] += 1
+                cls._jobs.pop(owner, None)
+                job = None
+            else:
+                cls._jobs[owner] = job
+                cls._stats["submitted"] += 1
+        # URL değişti (veya önceki iş başarısız): eskisi artık gereksiz
+        if prev is not None:
+            cls._cancel_job(prev)
+        return job
+
+    @classmethod
+    def _cancel_job(cls, job: PrefetchJob) -> bool:
+        if not job.cancel():
+            return False
+        with cls._lock:
+            cls._stats["cancelled"] += 1
+            if cls._jobs.get(job.owner) is job:
+                del cls._jobs[job.owner]
+        return True
+
+    @classmethod
+    def cancel(cls, owner: str) -> bool:
+        with cls._lock:
+            job = cls._jobs.get(owner)
+        return job is not None and cls._cancel_job(job)
+
+    @classmethod
+    def claim(cls, owner: str, url: str) -> Optional[PrefetchJob]:
+        """
+        owner + url için devralınabilir (süren ya da biten) işi döndür; beklemez.
+        Henüz başlamamış iş iptal edilir (çağıran kendisi yapar).
+        """
+        with cls._lock:
+            job = cls._jobs.get(owner)
+        if job is None or job.url != url:
+            cls._count("misses")
+            return None
+        if job.status == "queued":
+            cls._cancel_job(job)
+            cls._count("misses")
+            return None
+        return job
+
+    @classmethod
+    def result(cls, job: PrefetchJob, timeout=None):
+        """
+        İş sürüyorsa en fazla timeout saniye bekle. Süre dolarsa iş iptal
+        edilmez (sonraki analizde kullanılabilir).
+        Döner: (job_description, company_meta, job_ex, duplicate) veya None.
+        """
+        waited = not job.done.is_set()
+        if waited:
+            job.done.wait(timeout)
+        if job.status != "done":
+            cls._count("misses")
+            return None
+        cls._count("waited_hits" if waited else "hits")
+        return job.result
+
+    @classmethod
+    def _count(cls, key: str):
+        with cls._lock:
+            cls._stats[key] += 1
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            out = dict(cls._stats)
+            out["tracked"] = len(cls._jobs)
+            out["queued"] = cls._queue.qsize() if cls._queue is not None else 0
+            out["running"] = sum(1 for j in cls._jobs.values() if j.status == "running")
+            return out
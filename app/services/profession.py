@@ -1,8 +1,7 @@
 from typing import Tuple, Optional
 from ..models import ProfessionProfile
 from .llm_client import LLMClient
-from ..utils import extract_json
-from flask import current_app as app
+from ..config import current_config, current_logger
 
 class ProfessionDetector:
     """
@@ -10,7 +9,7 @@ class ProfessionDetector:
     Eşik altıysa UI manuel girişi ister.
     """
     @staticmethod
-    def detect(cv_text: str) -> Tuple[Optional[ProfessionProfile], float]:
+    def detect(cv_text: str, deadline=None) -> Tuple[Optional[ProfessionProfile], float]:
         system = "ATS/HR uzmanısın. CV’den birincil mesleği çıkar. Sadece geçerli JSON döndür."
         user = f"""
 CV'den meslek/profesyonu çıkar ve JSON ver.
@@ -29,11 +28,22 @@ CV'den meslek/profesyonu çıkar ve JSON ver.
 CV (first 4000 chars):
 {cv_text[:4000]}
 """
-        content = LLMClient.chat(
+        threshold = float(current_config().get("PROF_CONF_THRESHOLD", 0.6))
+
+        def _confident(o) -> bool:
+            # Düşük güven veya isimsiz sonuç -> büyük modele yükselt
+            try:
+                return bool(o.get("name")) and float(o.get("confidence") or 0.0) >= threshold
+            except (TypeError, ValueError):
+                return False
+
+        obj = LLMClient.chat_json(
+            "profession",
             [{"role":"system","content":system},{"role":"user","content":user}],
-            options={"temperature":0.1, "top_p":0.9}
+            accept=_confident,
+            options={"temperature":0.1, "top_p":0.9},
+            deadline=deadline
         )
-        obj = extract_json(content)
         conf = float(obj.get("confidence", 0.0) or 0.0)
         prof = ProfessionProfile(
             name=obj.get("name") or "unknown",
@@ -42,5 +52,5 @@ CV (first 4000 chars):
             technologies=obj.get("technologies") or [],
             description=obj.get("description") or "Meslek tespit edilemedi"
         )
-        app.logger.info(f"[ProfessionDetector] {prof.display_name} (conf={conf:.2f})")
+        current_logger().info(f"[ProfessionDetector] {prof.display_name} (conf={conf:.2f})")
         return prof, conf
@@ -0,0 +1,206 @@
+# app/services/profiler.py
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from functools import wraps
+from typing import Optional
+
+from flask import request, current_app as app
+
+# Özet için izlenen aşamalar: (dosya soneki, fonksiyon adı)
+STAGES = {
+    "ollama_wait": ("llm_client.py", "chat"),
+    "scrape": ("scraper.py", "fetch_job_description"),
+    "pdf": ("pdf_processor.py", "extract_text"),
+    "tfidf": ("analysis.py", "calculate_similarity"),
+}
+
+# Paket bazlı öz-süre (tottime) grupları
+PACKAGES = {
+    "pymupdf": ("fitz", "pymupdf"),
+    "beautifulsoup": ("bs4",),
+    "sklearn": ("sklearn", "scipy", "numpy"),
+    "network": ("requests", "urllib3", "socket.py", "ssl.py", "http/client.py"),
+}
+
+
+class ProfileStore:
+    """
+    Son N profili paylaşılan bir dizinde tutan sınırlı depo. Her profil
+    <id>.pstats (marshal) + <id>.json (özet) olarak yazılır; böylece gunicorn
+    worker'larından hangisi cevap verirse versin tüm profiller görünür.
+    En eski profiller max_profiles aşılınca silinir.
+    """
+    _seq = itertools.count(1)
+    _ID_RE = re.compile(r"^[0-9]+-[0-9a-f]+$")
+
+    @classmethod
+    def add(cls, record: dict, prof: cProfile.Profile, directory: str, max_profiles: int = 20):
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, record["id"])
+        prof.dump_stats(base + ".pstats")
+        # Özet en son ve atomik yazılır: listede görünen profilin .pstats'ı hazırdır
+        tmp = f"{base}.json.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, ensure_ascii=False)
+        os.replace(tmp, base + ".json")
+        cls._prune(directory, max_profiles)
+
+    @classmethod
+    def _summaries(cls, directory: str) -> list:
+        out = []
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return out
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(directory, name), encoding="utf-8") as fh:
+                    out.append(json.load(fh))
+            except (OSError, ValueError):
+                continue  # başka worker o an siliyor
+        out.sort(key=lambda r: r.get("created", 0), reverse=True)
+        return out
+
+    @classmethod
+    def _prune(cls, directory: str, max_profiles: int):
+        for rec in cls._summaries(directory)[max(1, int(max_profiles)):]:
+            for ext in (".json", ".pstats"):
+                try:
+                    os.remove(os.path.join(directory, rec["id"] + ext))
+                except OSError:
+                    pass
+
+    @classmethod
+    def list(cls, directory: str) -> list:
+        return cls._summaries(directory)
+
+    @classmethod
+    def get(cls, directory: str, profile_id: str) -> Optional[dict]:
+        if not cls._ID_RE.match(profile_id or ""):
+            return None
+        base = os.path.join(directory, profile_id)
+        try:
+            with open(base + ".json", encoding="utf-8") as fh:
+                record = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(base + ".pstats"):
+            return None
+        record["profile"] = base + ".pstats"
+        return record
+
+
+def _summarize(stats: pstats.Stats) -> dict:
+    stages = {k: 0.0 for k in STAGES}
+    packages = {k: 0.0 for k in PACKAGES}
+    for (filename, _line, func), (_cc, _nc, tt, ct, _callers) in stats.stats.items():
+        fn = filename.replace("\\", "/")
+        for stage, (suffix, name) in STAGES.items():
+            if func == name and fn.endswith(suffix):
+                stages[stage] += ct
+        for pkg, needles in PACKAGES.items():
+            if any(f"/{n}" in fn for n in needles):
+                packages[pkg] += tt
+                break
+    return {
+        "stages_s": {k: round(v, 4) for k, v in stages.items()},
+        "package_self_s": {k: round(v, 4) for k, v in packages.items()},
+    }
+
+
+def stats_text(record: dict, limit: int = 60) -> str:
+    buf = io.StringIO()
+    st = pstats.Stats(record["profile"], stream=buf)
+    st.sort_stats("cumulative").print_stats(limit)
+    return buf.getvalue()
+
+
+def stats_bytes(record: dict) -> bytes:
+    # pstats.Stats(path) ile açılabilen marshal formatı (dump_stats çıktısı)
+    with open(record["profile"], "rb") as fh:
+        return fh.read()
+
+
+# cProfile aynı anda tek profiler'a izin verir (3.12+ sys.monitoring);
+# eşzamanlı isteklerde yalnızca biri profillenir.
+_active = threading.Lock()
+
+
+def _wanted() -> bool:
+    cfg = app.config
+    if not cfg.get("PROFILING_ENABLED"):
+        return False
+    if request.headers.get("X-Profile", "").strip() in ("1", "true", "yes"):
+        return True
+    rate = float(cfg.get("PROFILING_SAMPLE_RATE", 0.0) or 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def profiled(name: str):
+    """
+    Opt-in istek profilleme dekoratörü. PROFILING_ENABLED açıkken
+    'X-Profile: 1' başlığı ya da PROFILING_SAMPLE_RATE örneklemesiyle
+    çağrının cProfile kaydı alınır ve ProfileStore'a eklenir.
+    Yalnızca isteği işleyen thread profillenir; arka plan thread'leri
+    (ör. JobPrefetcher'ın ilan tarafı) kayda girmez.
+    """
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _wanted() or not _active.acquire(blocking=False):
+                return fn(*args, **kwargs)
+            prof = cProfile.Profile()
+            t0 = time.perf_counter()
+            try:
+                prof.enable()
+            except ValueError:
+                # Başka bir profil aracı etkin
+                _active.release()
+                return fn(*args, **kwargs)
+            try:
+                resp = fn(*args, **kwargs)
+            finally:
+                prof.disable()
+                _active.release()
+            elapsed = time.perf_counter() - t0
+
+            min_ms = float(app.config.get("PROFILING_MIN_MS", 0) or 0)
+            if elapsed * 1000.0 < min_ms:
+                return resp
+
+            prof.create_stats()
+            record = {
+                "id": f"{next(ProfileStore._seq)}-{uuid.uuid4().hex[:8]}",
+                "endpoint": name,
+                "path": request.path,
+                "created": time.time(),
+                "duration_ms": round(elapsed * 1000.0, 1),
+            }
+            record.update(_summarize(pstats.Stats(prof)))
+            try:
+                ProfileStore.add(record, prof, app.config["PROFILING_DIR"],
+                                 app.config.get("PROFILING_MAX_PROFILES", 20))
+            except OSError as e:
+                app.logger.warning(f"[Profile] could not store {record['id']}: {e}")
+                return resp
+            app.logger.info(f"[Profile] {name} {record['duration_ms']}ms -> {record['id']}")
+
+            try:
+                resp_obj = app.make_response(resp)
+                resp_obj.headers["X-Profile-Id"] = record["id"]
+                return resp_obj
+            except Exception:
+                return resp
+        return wrapper
+    return deco
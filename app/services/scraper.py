@@ -1,27 +1,146 @@
-import re, requests
+import re, requests, threading, time
+from http.cookiejar import DefaultCookiePolicy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
 from bs4 import BeautifulSoup
-from flask import current_app as app
+from requests.adapters import HTTPAdapter
+from ..config import current_config, current_logger
+from ..models import FetchResult
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+def _build_session(pool_size: int = 32) -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    s.headers.update(HEADERS)
+    # Oturum tüm kullanıcıların çekimlerinde ortak: site çerezleri saklanmaz
+    # (kullanıcılar arası sızıntı ve sınırsız büyüyen cookie jar olmasın)
+    s.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return s
+
+# Süreç genelinde paylaşılan bağlantı havuzu (keep-alive ile yeniden kullanım)
+_session = _build_session()
+
+def reset_session():
+    """Bağlantı havuzunu yeniden kur (fork sonrası çocuk süreçte miras soketleri kullanmamak için)."""
+    global _session
+    _session = _build_session()
+
+
+class DomainThrottle:
+    """Alan adı başına eşzamanlılık sınırı + istekler arası asgari aralık."""
+
+    def __init__(self, per_domain: int = 2, min_interval: float = 1.0):
+        self.per_domain = max(1, per_domain)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._sems = {}
+        self._next = {}
+
+    def acquire(self, domain: str) -> float:
+        """Slot alınana kadar bekle; beklenen süreyi döndür."""
+        t0 = time.perf_counter()
+        with self._lock:
+            sem = self._sems.setdefault(domain, threading.Semaphore(self.per_domain))
+        sem.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(domain, now))
+            self._next[domain] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return time.perf_counter() - t0
+
+    def release(self, domain: str):
+        self._sems[domain].release()
+
 
 class WebScraper:
     @staticmethod
-    def fetch_job_description(url: str) -> str:
+    def _extract_text(html: str) -> str:
+        soup = BeautifulSoup(html, "html.parser")
+        selectors = [
+            "article", "main", "[role=main]",
+            ".job-description", ".jobsearch-JobComponent",
+            ".content", "#job-description", ".job-detail"
+        ]
+        for sel in selectors:
+            el = soup.select_one(sel)
+            if el:
+                text = el.get_text(" ", strip=True)
+                if len(text) > 500:
+                    return re.sub(r"\s+", " ", text)
+        return re.sub(r"\s+", " ", soup.get_text(" ", strip=True))
+
+    @staticmethod
+    def fetch_job_description(url: str, timeout=None) -> str:
         try:
-            headers = {"User-Agent": "Mozilla/5.0"}
-            resp = requests.get(url, timeout=15, headers=headers)
+            resp = _session.get(url, timeout=timeout or current_config().get("SCRAPER_TIMEOUT", 15))
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-            selectors = [
-                "article", "main", "[role=main]",
-                ".job-description", ".jobsearch-JobComponent",
-                ".content", "#job-description", ".job-detail"
-            ]
-            for sel in selectors:
-                el = soup.select_one(sel)
-                if el:
-                    text = el.get_text(" ", strip=True)
-                    if len(text) > 500:
-                        return re.sub(r"\s+", " ", text)
-            return re.sub(r"\s+", " ", soup.get_text(" ", strip=True))
+            return WebScraper._extract_text(resp.text)
         except Exception as e:
-            app.logger.error("Web scraping error: %s", e)
+            current_logger().error("Web scraping error: %s", e)
             raise Exception(f"İş ilanı alınamadı: {e}")
+
+    @staticmethod
+    def fetch_many(
+        urls: Iterable[str],
+        max_workers=None,
+        per_domain=None,
+        min_interval=None,
+        timeout=None,
+    ) -> Iterator[FetchResult]:
+        """
+        URL listesini eşzamanlı çek; sonuçlar tamamlandıkça döner.
+        Toplam eşzamanlılık max_workers, alan adı başına per_domain ile
+        sınırlıdır; aynı alan adına istekler arasında en az min_interval
+        saniye bırakılır. Bağlantılar ortak havuzdan yeniden kullanılır.
+        """
+        cfg = current_config()
+        max_workers = int(max_workers or cfg.get("SCRAPER_MAX_CONCURRENCY", 8))
+        throttle = DomainThrottle(
+            per_domain=int(per_domain or cfg.get("SCRAPER_PER_DOMAIN", 2)),
+            min_interval=float(cfg.get("SCRAPER_DOMAIN_INTERVAL", 1.0) if min_interval is None else min_interval),
+        )
+        timeout = timeout or cfg.get("SCRAPER_TIMEOUT", 15)
+        log = current_logger()
+
+        def _one(url: str) -> FetchResult:
+            domain = urlsplit(url).netloc.lower()
+            waited = throttle.acquire(domain)
+            t0 = time.perf_counter()
+            status = None
+            try:
+                resp = _session.get(url, timeout=timeout)
+                status = resp.status_code
+                resp.raise_for_status()
+                text = WebScraper._extract_text(resp.text)
+                return FetchResult(url=url, ok=True, text=text, status=status,
+                                   elapsed=time.perf_counter() - t0, waited=waited)
+            except Exception as e:
+                log.warning("Bulk fetch error %s: %s", url, e)
+                return FetchResult(url=url, ok=False, error=str(e), status=status,
+                                   elapsed=time.perf_counter() - t0, waited=waited)
+            finally:
+                throttle.release(domain)
+
+        # Alan adlarını sırayla karıştır: tek bir alan adının URL'leri tüm
+        # worker'ları kendi sınırında bekletip diğerlerini geciktirmesin
+        by_domain = {}
+        for u in dict.fromkeys(u.strip() for u in urls if u and u.strip()):
+            by_domain.setdefault(urlsplit(u).netloc.lower(), []).append(u)
+        unique = [u for group in zip_longest(*by_domain.values()) for u in group if u]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="fetch") as pool:
+            futures = [pool.submit(_one, u) for u in unique]
+            try:
+                for fut in as_completed(futures):
+                    yield fut.result()
+            finally:
+                # Tüketici erken bırakırsa bekleyen istekleri başlatma
+                for fut in futures:
+                    fut.cancel()
@@ -2,7 +2,7 @@
 import logging
 import re
 from .llm_client import LLMClient
-from ..utils import extract_json, normalize_token  # varsa; yoksa analyze içindeki util'i buraya taşıyın
+from ..utils import normalize_token
 
 log = logging.getLogger(__name__)
 
@@ -24,27 +24,31 @@ ALIASES = {
     ". net": ".net",
 }
 
+_NON_SKILL = re.compile(r"[^a-z0-9#+. ]+")
+
 def canon(s: str) -> str:
     t = normalize_token(s)
-    t = re.sub(r"[^a-z0-9#+. ]+", " ", t).strip()
+    t = _NON_SKILL.sub(" ", t).strip()
     return ALIASES.get(t, t)
 
 class SkillExtractor:
     @staticmethod
-    def extract(text: str) -> list[str]:
+    def extract(text: str, deadline=None) -> list[str]:
         system = "You extract concise professional skills/technologies from text. Return STRICT JSON."
         user = f'''
 Return only JSON: {{"skills": ["..."], "confidence": 0.0-1.0}}
 TEXT:
 {text[:2500]}
 '''
-        content = LLMClient.chat(
+        obj = LLMClient.chat_json(
+            "skills",
             [{"role":"system","content":system}, {"role":"user","content":user}],
+            accept=lambda o: isinstance(o.get("skills"), list) and bool(o.get("skills")),
             options={"temperature":0.0},
             timeout=90,
-            format_json=True
+            format_json=True,
+            deadline=deadline
         )
-        obj = extract_json(content)
         skills = obj.get("skills") or []
         # uniq + sıralı
         seen, out = set(), []
@@ -69,7 +73,7 @@ class SkillAligner:
         }
 
     @staticmethod
-    def align(job_skills: list[str], cv_skills: list[str]) -> dict:
+    def align(job_skills: list[str], cv_skills: list[str], deadline=None) -> dict:
         # Önce hızlı deterministik normalizasyon (zaten çoğu işi çözer)
         base = SkillAligner._fallback(job_skills, cv_skills)
         # LLM ile ince düzeltme (zaman aşımında base’e döner)
@@ -85,13 +89,15 @@ Return JSON:
 JOB_SKILLS: {job_skills[:50]}
 CV_SKILLS: {cv_skills[:80]}
 """
-            content = LLMClient.chat(
+            obj = LLMClient.chat_json(
+                "align",
                 [{"role":"system","content":system}, {"role":"user","content":user}],
+                accept=lambda o: all(isinstance(o.get(k, []), list) for k in ("matched", "missing", "deduped_cv")),
                 options={"temperature":0.0},
                 timeout=90,
-                format_json=True
+                format_json=True,
+                deadline=deadline
             )
-            obj = extract_json(content)
             # emniyetli birleşim: LLM çıktısı + base
             result = {
                 "matched": obj.get("matched") or base["matched"],
@@ -101,4 +107,4 @@ CV_SKILLS: {cv_skills[:80]}
             return result
         except Exception as e:
             log.warning("SkillAligner LLM timeout/fail; using fallback. %s", e)
-            return base
+            return dict(base, fallback=True)
@@ -0,0 +1,159 @@
+# app/services/sse_relay.py
+import json
+import re
+import time
+from typing import Iterable, Iterator, Optional
+
+from ..config import current_logger
+
+# Ollama satırlarında üst seviye anahtarlar; içerik içindeki tırnaklar kaçışlı
+# (\"done\") olduğu için bu desenler yalnızca gerçek anahtarlarla eşleşir.
+_DONE_RE = re.compile(r'"done"\s*:\s*true')
+_ERROR_RE = re.compile(r'"error"\s*:')
+
+RELAY_MODES = ("parse", "passthrough", "coalesce")
+
+
+class SSERelay:
+    """
+    Ollama NDJSON akışını SSE çerçevelerine aktarır.
+
+    - parse:       her satır json.loads + json.dumps (eski davranış)
+    - passthrough: satır olduğu gibi 'data:' çerçevesine konur, JSON işlenmez
+    - coalesce:    token parçaları birleştirilip flush_ms ya da flush_bytes
+                   dolduğunda tek çerçeve olarak gönderilir
+
+    Satırlar str ya da bytes olabilir: Ollama charset'siz
+    'application/x-ndjson' gönderdiğinden iter_lines(decode_unicode=True)
+    bytes döndürür; bytes satırlar UTF-8 olarak çözülür.
+
+    state sözlüğüne 'done', 'error' ve 'tokens' (okunan Ollama satırı, ~token)
+    yazılır; collect verilirse içerik parçaları (örn. cevap önbelleği için)
+    bu listeye eklenir.
+    """
+
+    @staticmethod
+    def frames(
+        lines: Iterable[str],
+        mode: str = "coalesce",
+        flush_ms: int = 50,
+        flush_bytes: int = 1024,
+        collect: Optional[list] = None,
+        state: Optional[dict] = None,
+    ) -> Iterator[str]:
+        state = state if state is not None else {}
+        state.setdefault("done", False)
+        state.setdefault("error", None)
+        state.setdefault("tokens", 0)
+        if mode not in RELAY_MODES:
+            current_logger().warning(
+                f"[SSERelay] unknown CHAT_RELAY_MODE '{mode}' (expected one of {RELAY_MODES}); using 'coalesce'"
+            )
+            mode = "coalesce"
+        lines = SSERelay._decoded(lines)
+        if mode == "passthrough":
+            return SSERelay._passthrough(lines, collect, state)
+        if mode == "coalesce":
+            return SSERelay._coalesce(lines, flush_ms / 1000.0, flush_bytes, collect, state)
+        return SSERelay._parse(lines, collect, state)
+
+    @staticmethod
+    def _decoded(lines: Iterable) -> Iterator[str]:
+        for raw in lines:
+            yield raw.decode("utf-8", errors="replace") if isinstance(raw, (bytes, bytearray)) else raw
+
+    @staticmethod
+    def _content(obj: dict) -> str:
+        return (obj.get("message") or {}).get("content") or ""
+
+    @staticmethod
+    def _parse(lines, collect, state):
+        for raw in lines:
+            if not raw:
+                continue
+            state["tokens"] += 1
+            try:
+                obj = json.loads(raw)
+            except Exception:
+                continue
+            if collect is not None:
+                collect.append(SSERelay._content(obj))
+            yield f"data: {json.dumps(obj, ensure_ascii=False)}\n\n"
+            if obj.get("error"):
+                state["error"] = obj["error"]
+            if obj.get("done"):
+                state["done"] = True
+                break
+
+    @staticmethod
+    def _passthrough(lines, collect, state):
+        for raw in lines:
+            if not raw:
+                continue
+            state["tokens"] += 1
+            if collect is not None:
+                try:
+                    collect.append(SSERelay._content(json.loads(raw)))
+                except Exception:
+                    continue
+            yield f"data: {raw}\n\n"
+            if _ERROR_RE.search(raw):
+                state["error"] = raw
+            if _DONE_RE.search(raw):
+                state["done"] = True
+                break
+
+    @staticmethod
+    def _coalesce(lines, flush_s, flush_bytes, collect, state):
+        buf, size = [], 0
+        last = time.monotonic()
+
+        def _flush():
+            return f'data: {json.dumps({"message": {"role": "assistant", "content": "".join(buf)}, "done": False}, ensure_ascii=False)}\n\n'
+
+        for raw in lines:
+            if not raw:
+                continue
+            state["tokens"] += 1
+            if _ERROR_RE.search(raw) or _DONE_RE.search(raw):
+                # Terminal satırlar: bekleyen içeriği gönder, satırı aynen ilet
+                try:
+                    obj = json.loads(raw)
+                except Exception:
+                    continue
+                piece = SSERelay._content(obj)
+                if piece:
+                    buf.append(piece)
+                    if collect is not None:
+                        collect.append(piece)
+                if buf:
+                    yield _flush()
+                    buf, size = [], 0
+                if "message" in obj:
+                    obj["message"] = dict(obj["message"], content="")
+                yield f"data: {json.dumps(obj, ensure_ascii=False)}\n\n"
+                if obj.get("error"):
+                    state["error"] = obj["error"]
+                if obj.get("done"):
+                    state["done"] = True
+                    break
+                continue
+
+            try:
+                piece = SSERelay._content(json.loads(raw))
+            except Exception:
+                continue
+            if not piece:
+                continue
+            buf.append(piece)
+            size += len(piece.encode("utf-8"))
+            if collect is not None:
+                collect.append(piece)
+
+            now = time.monotonic()
+            if size >= flush_bytes or now - last >= flush_s:
+                yield _flush()
+                buf, size, last = [], 0, now
+
+        if buf:
+            yield _flush()
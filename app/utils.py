@@ -1,4 +1,5 @@
 import json, re
+from functools import lru_cache
 
 def extract_json(text: str) -> dict:
     try:
@@ -9,13 +10,6 @@ def extract_json(text: str) -> dict:
             raise ValueError("LLM JSON parse failed")
         return json.loads(m.group(0))
 
-def normalize_token(s: str) -> str:
-    s = (s or "").strip().lower()
-    s = re.sub(r"[\s\-_]+", " ", s)
-    s = s.replace("’","'").replace("`","'")
-    s = s.replace(". net", ".net")
-    return s
-
 def uniq_preserve(xs):
     seen=set(); out=[]
     for x in xs or []:
@@ -25,9 +19,24 @@ def uniq_preserve(xs):
             seen.add(k); out.append(x)
     return out
 
-def normalize_token(s: str) -> str:
-    s = (s or "").strip().lower()
-    s = re.sub(r"[\s\-_]+", " ", s)
+_TOKEN_SEP = re.compile(r"[\s\-_/]+")
+# Bu uzunluğa kadar olan girdiler (yetenek/soru gibi kısa token'lar) önbelleğe alınır;
+# ilan/CV gibi uzun metinler doğrudan hesaplanır ve önbelleği şişirmez.
+_TOKEN_CACHE_MAX_LEN = 128
+
+def _normalize_token(s: str) -> str:
+    s = s.strip().lower()
+    s = _TOKEN_SEP.sub(" ", s)
     s = s.replace("’","'").replace("`","'")
     s = s.replace(". net", ".net")
     return s
+
+_normalize_token_cached = lru_cache(maxsize=8192)(_normalize_token)
+
+def normalize_token(s: str) -> str:
+    """Yetenek/soru token'ı normalizasyonu (tek ortak tanım, kısa girdiler memoize edilir)."""
+    if not s:
+        return ""
+    if len(s) > _TOKEN_CACHE_MAX_LEN:
+        return _normalize_token(s)
+    return _normalize_token_cached(s)
@@ -0,0 +1,91 @@
+# benchmarks/bench_relay.py
+"""
+Chat SSE aktarım modları (parse / passthrough / coalesce) için mikro benchmark.
+
+    python -m benchmarks.bench_relay [--repeat 5] [--tokens 2000]
+
+Önce üç modun da aynı içeriği, aynı 'done'/'error' durumunu ürettiği
+doğrulanır — satırlar hem str hem bytes olarak verilir (gerçek Ollama
+charset'siz NDJSON gönderir, iter_lines bytes döndürür). Sonra modların
+satır başına maliyeti karşılaştırılır.
+"""
+import argparse
+import json
+import random
+import timeit
+
+from app.services.sse_relay import SSERelay, RELAY_MODES
+
+
+# ---------------- veri üretimi ----------------
+WORDS = ["Merhaba", " CV", "'nizde", " Python", " ve", " \"Docker\"", " deneyimi", " güçlü", ".", "\n",
+         " öneri", ":", " {done}", " İş", " ilanı", " Kubernetes", " istiyor", " 🚀"]
+
+def make_lines(rng, n, error=False):
+    lines = [
+        json.dumps({"model": "m", "message": {"role": "assistant", "content": rng.choice(WORDS)}, "done": False},
+                   ensure_ascii=False)
+        for _ in range(n)
+    ]
+    if error:
+        lines.append(json.dumps({"error": "model yüklenemedi"}, ensure_ascii=False))
+    lines.append(json.dumps({"model": "m", "message": {"role": "assistant", "content": ""}, "done": True}))
+    return lines
+
+def as_bytes(lines):
+    return [l.encode("utf-8") for l in lines] + [b""]
+
+
+# ---------------- ölçüm ----------------
+def relay(lines, mode):
+    parts, state = [], {}
+    frames = list(SSERelay.frames(iter(lines), mode=mode, flush_ms=10_000, flush_bytes=1 << 30,
+                                  collect=parts, state=state))
+    content = []
+    for f in frames:
+        assert f.startswith("data: ") and f.endswith("\n\n"), f"bad frame: {f!r}"
+        assert "b'" not in f[:8], f"bytes leaked into frame: {f!r}"
+        obj = json.loads(f[6:])
+        content.append((obj.get("message") or {}).get("content") or "")
+    return "".join(content), "".join(parts), bool(state["done"]), state["error"] is not None
+
+def check_equivalence(rng):
+    n = 0
+    for error in (False, True):
+        for size in (0, 1, 50):
+            text = make_lines(rng, size, error)
+            expected = None
+            for mode in RELAY_MODES:
+                for lines in (text, as_bytes(text)):
+                    got = relay(lines, mode)
+                    assert got[0] == got[1], f"{mode}: frames != collected content"
+                    assert got[2] and got[3] == error, f"{mode}: state mismatch {got[2:]}"
+                    expected = expected or got[0]
+                    assert got[0] == expected, f"{mode}: content mismatch"
+                    n += 1
+    return n
+
+def best(fn, repeat, number):
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.bench_relay")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--tokens", type=int, default=2000, help="Akıştaki Ollama satırı sayısı")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    n = check_equivalence(rng)
+    print(f"equivalence: {n} streams OK (str + bytes lines)")
+
+    lines = as_bytes(make_lines(rng, args.tokens))
+    print(f"\n{f'relay ({args.tokens} lines)':<24}{'per stream':>12}{'per line':>12}{'frames':>8}")
+    for mode in RELAY_MODES:
+        t = best(lambda: list(SSERelay.frames(iter(lines), mode=mode)), args.repeat, 5)
+        frames = len(list(SSERelay.frames(iter(lines), mode=mode)))
+        print(f"{mode:<24}{t * 1e3:>10.2f}ms{t / len(lines) * 1e6:>10.2f}us{frames:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/bench_text.py
+"""
+CV metin özelliği taraması ve token normalizasyonu için mikro benchmark.
+
+    python -m benchmarks.bench_text [--repeat 5] [--batch 200]
+
+Eski çoklu-regex uygulaması (6 bölüm + 2 iletişim araması) referans olarak
+burada tutulur; önce sonuçların birebir aynı olduğu doğrulanır, sonra
+büyük CV'ler ve toplu iş yükü üzerinde süreler karşılaştırılır.
+"""
+import argparse
+import random
+import re
+import time
+import timeit
+
+from app.services.cv_scanner import CVScanner
+from app.utils import normalize_token, _normalize_token, _normalize_token_cached
+
+
+# ---------------- referans (eski) uygulama ----------------
+def legacy_sections(cv_text):
+    return {
+        "Kişisel Bilgiler": bool(re.search(r"\b(kişisel|personal|contact|iletişim)\b", cv_text, re.I)),
+        "Özet/Profil":     bool(re.search(r"\b(özet|summary|profile|hakkında|about)\b", cv_text, re.I)),
+        "Deneyim":         bool(re.search(r"\b(deneyim|experience|work|career|iş)\b", cv_text, re.I)),
+        "Eğitim":          bool(re.search(r"\b(eğitim|education|university|üniversite|okul)\b", cv_text, re.I)),
+        "Yetenekler":      bool(re.search(r"\b(yetenekler|skills|teknoloji|competenc)\b", cv_text, re.I)),
+        "Sertifikalar":    bool(re.search(r"\b(sertifika|certificate|certification)\b", cv_text, re.I))
+    }
+
+def legacy_contact(cv_text):
+    phone_pattern = r"(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4,}"
+    email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+    return bool(re.search(phone_pattern, cv_text)), bool(re.search(email_pattern, cv_text))
+
+def legacy_scan(cv_text):
+    sections = legacy_sections(cv_text)
+    has_phone, has_email = legacy_contact(cv_text)
+    return sections, has_phone, has_email, len(cv_text)
+
+def new_scan(cv_text):
+    f = CVScanner.scan(cv_text)
+    return f.sections, f.has_phone, f.has_email, f.length
+
+def legacy_normalize_token(s):
+    s = (s or "").strip().lower()
+    s = re.sub(r"[\s\-_/]+", " ", s)
+    s = s.replace("’", "'").replace("`", "'")
+    s = s.replace(". net", ".net")
+    return s
+
+
+# ---------------- veri üretimi ----------------
+FILLER = (
+    "Led migration of billing services to Kubernetes reducing latency by 35 percent. "
+    "Mentored 4 engineers and owned on-call rotation for payments platform. "
+    "Python Django PostgreSQL Redis Celery AWS Terraform CI/CD pipelines. "
+    "Müşteri odaklı ürün geliştirme süreçlerinde çapraz ekiplerle çalıştı. "
+)
+HEADINGS = ["PERSONAL", "İLETİŞİM", "Summary", "ÖZET", "Experience", "DENEYİM",
+            "Education", "EĞİTİM", "Skills", "YETENEKLER", "Certifications", "SERTİFİKA"]
+CONTACTS = ["jane.doe@example.com", "+90 555 123 4567", "(212) 555-0199", "ayse@firma.com.tr"]
+NOISE = ["work@x.io", "iş5551234567", "+905551234567@mail.com", "workflow", "İŞ", "competencies",
+         "skills_matrix", "a@b", "555 12 34", "kişisel-bilgiler", "ABOUT:", "x" * 40]
+
+def make_cv(rng, size, sections=0.8, contacts=0.8, noise=0.2):
+    parts = []
+    while sum(len(p) for p in parts) < size:
+        r = rng.random()
+        if r < 0.05 * sections:
+            parts.append(rng.choice(HEADINGS))
+        elif r < 0.05 * sections + 0.02 * contacts:
+            parts.append(rng.choice(CONTACTS))
+        elif r < 0.05 * sections + 0.02 * contacts + 0.05 * noise:
+            parts.append(rng.choice(NOISE))
+        else:
+            parts.append(FILLER)
+    return " ".join(parts)
+
+def fuzz_texts(rng, n):
+    # Sınır durumları: rastgele karakter karışımları
+    alphabet = list("abcdeiIİıkKworşŞğüçöskſl@+.-_%() 0123456789٣\t\n") + ["work", "iş", "skills", "about", "x@y.com"]
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 120))) for _ in range(n)]
+
+
+# ---------------- ölçüm ----------------
+def best(fn, repeat, number):
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number
+
+def check_equivalence(rng):
+    texts = fuzz_texts(rng, 20000) + NOISE + CONTACTS + HEADINGS
+    texts += [make_cv(rng, 3000, s, c, 1.0) for s in (0, 0.2, 1) for c in (0, 1) for _ in range(30)]
+    for t in texts:
+        assert legacy_scan(t) == new_scan(t), f"scanner mismatch: {t!r}"
+        assert legacy_normalize_token(t) == normalize_token(t), f"normalize mismatch: {t!r}"
+    return len(texts)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.bench_text")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--batch", type=int, default=200, help="Toplu iş yükündeki CV sayısı")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    n = check_equivalence(rng)
+    print(f"equivalence: {n} texts OK")
+
+    print(f"\n{'scan':<34}{'legacy':>12}{'scanner':>12}{'speedup':>9}")
+    cases = [
+        ("typical CV (6 KB)", make_cv(rng, 6_000), 200),
+        ("large CV (60 KB)", make_cv(rng, 60_000), 50),
+        ("large CV, no sections (60 KB)", make_cv(rng, 60_000, sections=0, noise=0), 20),
+        ("large CV, no contact (60 KB)", make_cv(rng, 60_000, contacts=0, noise=0), 20),
+    ]
+    for label, text, number in cases:
+        a = best(lambda: legacy_scan(text), args.repeat, number)
+        b = best(lambda: new_scan(text), args.repeat, number)
+        print(f"{label:<34}{a * 1e3:>10.3f}ms{b * 1e3:>10.3f}ms{a / b:>8.1f}x")
+
+    batch = [make_cv(rng, rng.randint(2_000, 20_000), rng.random(), rng.random(), 0.1) for _ in range(args.batch)]
+    t0 = time.perf_counter()
+    for t in batch:
+        legacy_scan(t)
+    a = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for t in batch:
+        new_scan(t)
+    b = time.perf_counter() - t0
+    print(f"{f'batch ({args.batch} CVs)':<34}{a * 1e3:>10.1f}ms{b * 1e3:>10.1f}ms{a / b:>8.1f}x")
+
+    # Token normalizasyonu: hizalama/dedup gibi yerlerde aynı yetenekler tekrar tekrar normalize edilir
+    vocab = ["Python", "Node.js", "CI/CD", "Machine-Learning", "C Sharp", "ASP. NET", "Type_Script",
+             "PostgreSQL", "Docker", "Kubernetes", "REST API", "scikit-learn"]
+    tokens = [rng.choice(vocab) for _ in range(10_000)]
+    _normalize_token_cached.cache_clear()
+    print(f"\n{'normalize_token (10k tokens)':<34}{'legacy':>12}{'memoized':>12}{'speedup':>9}")
+    a = best(lambda: [legacy_normalize_token(t) for t in tokens], args.repeat, 5)
+    b = best(lambda: [normalize_token(t) for t in tokens], args.repeat, 5)
+    c = best(lambda: [_normalize_token(t) for t in tokens], args.repeat, 5)
+    print(f"{'repeated vocabulary':<34}{a * 1e3:>10.2f}ms{b * 1e3:>10.2f}ms{a / b:>8.1f}x")
+    print(f"{'  (precompiled, no memo)':<34}{'':>12}{c * 1e3:>10.2f}ms{a / c:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# gunicorn.conf.py
+# Üretim başlatıcısı:  gunicorn -c gunicorn.conf.py run:app
+#
+# - preload_app: Flask uygulaması (PyMuPDF, scikit-learn, varlık hattı) ana
+#   süreçte bir kez yüklenir, worker'lar copy-on-write paylaşır.
+# - gthread worker: her süreçte birden çok thread; uzun SSE sohbetleri
+#   heartbeat'i bloklamaz.
+# - Worker geri dönüşümü: N istekten sonra (max_requests) veya RSS sınırı
+#   aşıldığında worker işini bitirip yenisiyle değiştirilir.
+# - Kapanışta graceful_timeout boyunca açık SSE akışları tamamlanır.
+#
+# Oturumlar SESSION_FILE_DIR altında dosya sisteminde tutulduğu için tüm
+# worker'lar tarafından paylaşılır. Süreç içi önbellekler (cevap önbelleği,
+# model kullanım sayaçları) worker başınadır; doğruluk değil isabet oranı
+# etkilenir.
+import os
+import multiprocessing
+
+bind = os.environ.get("BIND", f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '8001')}")
+workers = int(os.environ.get("WEB_WORKERS", str(min(4, multiprocessing.cpu_count()))))
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", "8"))
+preload_app = True
+
+# Geri dönüşüm
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", "500"))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", "50"))
+max_rss_mb = int(os.environ.get("WEB_MAX_RSS_MB", "1024"))
+
+# Zaman aşımları: graceful_timeout uçuştaki sohbetlerin bitmesi için
+timeout = int(os.environ.get("WEB_TIMEOUT", "120"))
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", os.environ.get("OLLAMA_TIMEOUT", "60")))
+keepalive = int(os.environ.get("WEB_KEEPALIVE", "5"))
+
+accesslog = os.environ.get("WEB_ACCESS_LOG", "-")
+loglevel = os.environ.get("WEB_LOG_LEVEL", "info")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def post_request(worker, req, environ, resp):
+    if max_rss_mb and worker.alive and _rss_mb() > max_rss_mb:
+        worker.log.info("Worker %s RSS > %s MB; recycling", worker.pid, max_rss_mb)
+        worker.alive = False  # açık istekler bitince worker çıkar, arbiter yenisini başlatır
+
+
+def worker_int(worker):
+    worker.log.info("Worker %s interrupted; draining in-flight requests", worker.pid)
+
+
+def on_starting(server):
+    server.log.info(
+        "JobChat: %s workers x %s threads, max_requests=%s, max_rss=%sMB, graceful=%ss",
+        workers, threads, max_requests, max_rss_mb, graceful_timeout,
+    )
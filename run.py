@@ -1,3 +1,4 @@
+# Geliştirme sunucusu. Üretim için: gunicorn -c gunicorn.conf.py run:app
 from app import create_app
 
 app = create_app()
@@ -1,4 +1,5 @@
 let analysisData=null, eventSource=null, chatStartTime=null;
+let prefetchedUrl='', prefetchTimer=null;
 
 // ----------- helpers ----------
 function showAlert(type, message){
@@ -30,6 +31,19 @@ document.addEventListener('DOMContentLoaded',()=>{
   const form=document.getElementById('analyzeForm');
   if(form) form.addEventListener('submit', handleAnalysis);
 
+  // URL girilir girilmez ilan tarafı analizini arka planda başlat
+  const jobUrlInput=document.getElementById('jobUrl');
+  if(jobUrlInput){
+    jobUrlInput.addEventListener('input', ()=>{
+      clearTimeout(prefetchTimer);
+      prefetchTimer=setTimeout(()=>prefetchJob(jobUrlInput.value.trim()), 600);
+    });
+    jobUrlInput.addEventListener('change', ()=>{
+      clearTimeout(prefetchTimer);
+      prefetchJob(jobUrlInput.value.trim());
+    });
+  }
+
   // status ping
   fetch('/api/status').then(r=>r.json()).then(d=>{
     console.log('Status', d);
@@ -37,6 +51,18 @@ document.addEventListener('DOMContentLoaded',()=>{
 });
 
 // ----------- analysis ----------
+function prefetchJob(url){
+  const target = isValidUrl(url) ? url : '';
+  if(target===prefetchedUrl) return;
+  prefetchedUrl=target;
+  // boş URL sunucudaki bekleyen prefetch'i iptal eder
+  fetch('/api/analyze/prefetch', {
+    method:'POST',
+    headers:{'Content-Type':'application/json'},
+    body: JSON.stringify({ job_url: target })
+  }).catch(()=>{});
+}
+
 async function handleAnalysis(e){
   e.preventDefault();
 
@@ -240,6 +266,8 @@ function startChat(question){
   eventSource.onmessage=(ev)=>{
     try{
       const data=JSON.parse(ev.data);
+      // sunucu kopan akışa devam edemedi; cevap baştan gelecek
+      if(data.reset){ document.getElementById('chatResponse').textContent=''; return; }
       if(data.error){ handleChatError(data.error); return; }
       if(data.done){ handleChatComplete(); return; }
       const chunk=(data.message && data.message.content)?data.message.content:'';
@@ -251,7 +279,11 @@ function startChat(question){
     }catch(_){}
   };
 
-  eventSource.onerror=()=>{ handleChatError(i18n('chat.conn.lost')); };
+  // Geçici kopmalarda tarayıcı Last-Event-ID ile yeniden bağlanır; sunucu kaldığı yerden devam eder
+  eventSource.onerror=()=>{
+    if(eventSource && eventSource.readyState===EventSource.CONNECTING) return;
+    handleChatError(i18n('chat.conn.lost'));
+  };
 }
 
 function handleChatError(msg){